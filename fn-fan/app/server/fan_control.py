@@ -7,25 +7,39 @@
 独立运行，使用内存存储，支持 HTTP API
 """
 
+import asyncio
 import json
 import logging
 import os
 import re
+import shutil
 import signal
 import socket
-import threading
+import struct
+import sys
 import time
-from dataclasses import dataclass, field, asdict
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from http import HTTPStatus
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from subprocess import run, Popen, PIPE, DEVNULL
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import urlparse, parse_qs
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("fan_control")
 
+# HTTP 响应的 JSON 序列化：安装了 orjson 时优先使用，否则使用标准库（紧凑格式）
+try:
+    import orjson
+    _dumps: Callable[[Any], bytes] = orjson.dumps
+except ImportError:
+    _json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    
+    def _dumps(obj: Any) -> bytes:
+        return _json_encoder.encode(obj).encode("utf-8")
+
 ###############################################################################
 # 配置数据类
 ###############################################################################
@@ -111,19 +125,78 @@ class FanConfig:
     active_disks: List[str] = field(default_factory=list)
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # 浅拷贝：曲线点只会被整体替换，不会原地修改
+        return {
+            **self.__dict__,
+            "cpu_curve": list(self.cpu_curve),
+            "disk_curve": list(self.disk_curve),
+            "active_disks": list(self.active_disks),
+        }
     
     def update(self, data: Dict[str, Any]) -> None:
+        """更新配置：只接受已定义的字段，值的类型必须与默认值一致（数字字符串会转换为数值）"""
         for key, value in data.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
+            if key not in self.__dataclass_fields__:
+                continue
+            if key in ("cpu_curve", "disk_curve"):
+                coerced = self._coerce_curve(value)
+            else:
+                coerced = self._coerce(getattr(self, key), value)
+            if coerced is None:
+                logger.warning(f"忽略无效的配置项 {key}: {value!r}")
+                continue
+            setattr(self, key, coerced)
+    
+    @staticmethod
+    def _coerce(current: Any, value: Any) -> Any:
+        """按当前值的类型校验并转换新值，无效时返回 None"""
+        if isinstance(current, bool):
+            return value if isinstance(value, bool) else None
+        if isinstance(current, (int, float)):
+            if isinstance(value, bool):
+                return None
+            try:
+                return type(current)(value)
+            except (TypeError, ValueError):
+                return None
+        if isinstance(current, str):
+            return value if isinstance(value, str) else None
+        if isinstance(current, list):
+            # 硬盘 ID 列表
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                return None
+            return list(value)
+        return None
+    
+    @staticmethod
+    def _coerce_curve(value: Any) -> Optional[List[Dict[str, int]]]:
+        """校验风扇曲线：[{temp, pwm}, ...]，无效时返回 None"""
+        if not isinstance(value, list):
+            return None
+        curve = []
+        for point in value:
+            if not isinstance(point, dict):
+                return None
+            temp, pwm = point.get("temp"), point.get("pwm")
+            if isinstance(temp, bool) or isinstance(pwm, bool):
+                return None
+            try:
+                curve.append({"temp": int(temp), "pwm": int(pwm)})
+            except (TypeError, ValueError):
+                return None
+        return curve
     
     def save(self, path: str) -> bool:
         """保存配置到文件"""
+        return self.save_dict(path, self.to_dict())
+    
+    @staticmethod
+    def save_dict(path: str, data: Dict[str, Any]) -> bool:
+        """将配置快照（to_dict() 的结果）保存到文件"""
         try:
             os.makedirs(os.path.dirname(path), exist_ok=True)
             with open(path, 'w', encoding='utf-8') as f:
-                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+                json.dump(data, f, ensure_ascii=False, indent=2)
             logger.info(f"配置已保存到 {path}")
             return True
         except Exception as e:
@@ -156,7 +229,6 @@ class DiskInfo:
     serial: str = ""  # 序列号
     size: str = ""  # 容量
     disk_type: str = "HDD"  # HDD 或 SSD/NVMe
-    temp: Optional[int] = None  # 当前温度
     active: bool = False  # 是否参与调速
 
 
@@ -164,7 +236,7 @@ class DiskInfo:
 # 硬盘检测
 ###############################################################################
 
-def detect_all_disks() -> List[DiskInfo]:
+async def detect_all_disks() -> List[DiskInfo]:
     """自动检测所有硬盘"""
     disks = []
     by_path_dir = "/dev/disk/by-path"
@@ -177,18 +249,22 @@ def detect_all_disks() -> List[DiskInfo]:
     disk_counter = {"ata": 0, "nvme": 0, "usb": 0}
     
     try:
-        for entry in sorted(os.listdir(by_path_dir)):
+        # scandir 在读取目录时即带回文件类型，避免逐项 stat
+        with os.scandir(by_path_dir) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        
+        for dir_entry in entries:
+            entry = dir_entry.name
             # 跳过分区
             if "part" in entry:
                 continue
             
-            link_path = os.path.join(by_path_dir, entry)
-            if not os.path.islink(link_path):
+            if not dir_entry.is_symlink():
                 continue
             
             try:
-                real_path = os.path.realpath(link_path)
-                device = os.path.basename(real_path)
+                device = os.path.basename(os.readlink(dir_entry.path))
+                real_path = f"/dev/{device}"
                 
                 # 跳过已处理的设备
                 if device in seen_devices:
@@ -209,16 +285,16 @@ def detect_all_disks() -> List[DiskInfo]:
                     disk_id = f"Disk{disk_counter['ata']}"
                     # 通过 rotational 判断是 HDD 还是 SSD
                     disk_type = "HDD"
-                    rot_path = f"/sys/block/{device}/queue/rotational"
-                    if os.path.exists(rot_path):
-                        with open(rot_path) as f:
-                            if f.read().strip() == "0":
-                                disk_type = "SSD"
+                    try:
+                        if _sys_read_int(f"/sys/block/{device}/queue/rotational") == 0:
+                            disk_type = "SSD"
+                    except (OSError, ValueError):
+                        pass
                 else:
                     continue
                 
                 # 获取硬盘详细信息
-                model, serial, size = get_disk_info(device)
+                model, serial, size = await get_disk_info(device)
                 
                 disks.append(DiskInfo(
                     id=disk_id,
@@ -238,31 +314,43 @@ def detect_all_disks() -> List[DiskInfo]:
     return disks
 
 
-def get_disk_info(device: str) -> tuple:
+async def run_async(cmd: List[str], timeout: float) -> tuple:
+    """异步执行命令，返回 (returncode, stdout)，超时时终止进程并抛出 asyncio.TimeoutError"""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=PIPE,
+        stderr=DEVNULL,
+    )
+    try:
+        out, _ = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, out.decode("utf-8", errors="replace")
+
+
+async def get_disk_info(device: str) -> tuple:
     """获取硬盘的型号、序列号、容量"""
     model, serial, size = "", "", ""
     
     try:
         # 使用 lsblk 获取基本信息
-        result = run(
-            ["lsblk", "-d", "-o", "MODEL,SERIAL,SIZE", "-n", f"/dev/{device}"],
-            capture_output=True, text=True, timeout=5
+        returncode, stdout = await run_async(
+            ["lsblk", "-d", "-o", "MODEL,SERIAL,SIZE", "-n", f"/dev/{device}"], timeout=5
         )
-        if result.returncode == 0:
-            parts = result.stdout.strip().split()
+        if returncode == 0:
+            parts = stdout.strip().split()
             if len(parts) >= 1:
                 # MODEL 可能包含空格，SIZE 在最后
                 size = parts[-1] if parts else ""
                 model = " ".join(parts[:-1]) if len(parts) > 1 else parts[0] if parts else ""
         
         # 尝试从 smartctl 获取更详细信息
-        result = run(
-            ["smartctl", "-i", f"/dev/{device}", "-j"],
-            capture_output=True, text=True, timeout=10
-        )
-        if result.returncode == 0:
+        returncode, stdout = await run_async(["smartctl", "-i", f"/dev/{device}", "-j"], timeout=10)
+        if returncode == 0:
             try:
-                data = json.loads(result.stdout)
+                data = json.loads(stdout)
                 model = data.get("model_name", model) or model
                 serial = data.get("serial_number", serial) or serial
             except json.JSONDecodeError:
@@ -277,15 +365,126 @@ def get_disk_info(device: str) -> tuple:
 # 温度读取
 ###############################################################################
 
-def read_cpu_temp() -> Optional[int]:
-    """读取 CPU 温度"""
+# hwmon 设备目录
+HWMON_DIR = "/sys/class/hwmon"
+
+# CPU 温度传感器驱动名（按优先级排列）
+CPU_HWMON_NAMES = ("coretemp", "k10temp", "zenpower")
+
+# CPU 温度标签（按优先级排列）
+CPU_TEMP_LABELS = ("Package id", "Tctl", "Tdie", "Core 0")
+
+# 优先读取风扇转速的驱动名前缀（it87 驱动按芯片型号命名，如 it8620），
+# 其余暴露 fan*_input 的设备排在其后
+FAN_HWMON_PREFIXES = ("it8",)
+
+# sensors 输出解析（仅在未发现 hwmon 传感器时使用）
+_CPU_TEMP_RE = re.compile(r"[+]?(\d+(?:\.\d+)?)[°]?C")
+_FAN_LABEL_RE = re.compile(r"fan\d+:", re.IGNORECASE)
+_FAN_RPM_RE = re.compile(r"(\d+)\s*RPM")
+
+
+def _read_sysfs_text(path: str) -> str:
+    with open(path) as f:
+        return f.read().strip()
+
+
+def _sys_read_int(path: str) -> int:
+    """直接通过文件描述符读取 sysfs 整数值，失败时抛出 OSError / ValueError"""
+    fd = os.open(path, os.O_RDONLY)
     try:
-        result = run(["sensors"], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            for line in result.stdout.split("\n"):
+        return int(os.read(fd, 32))
+    finally:
+        os.close(fd)
+
+
+def _sys_write_int(path: str, value: int) -> None:
+    """直接通过文件描述符写入 sysfs 整数值，失败时抛出 OSError"""
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        os.write(fd, b"%d" % value)
+    finally:
+        os.close(fd)
+
+
+def read_sysfs_int(path: str) -> Optional[int]:
+    """读取 sysfs 整数值"""
+    try:
+        return _sys_read_int(path)
+    except (OSError, ValueError) as e:
+        logger.debug(f"读取 {path} 失败: {e}")
+    return None
+
+
+def _find_cpu_temp_input(hwmon: str, files: List[str]) -> Optional[str]:
+    """在 CPU hwmon 目录中按标签优先级选择温度输入文件"""
+    labels = {}
+    for name in files:
+        if name.startswith("temp") and name.endswith("_label"):
+            try:
+                labels[name[:-len("_label")]] = _read_sysfs_text(os.path.join(hwmon, name))
+            except OSError:
+                pass
+    
+    for tag in CPU_TEMP_LABELS:
+        for sensor in sorted(labels):
+            if tag in labels[sensor] and f"{sensor}_input" in files:
+                return os.path.join(hwmon, f"{sensor}_input")
+    
+    if "temp1_input" in files:
+        return os.path.join(hwmon, "temp1_input")
+    return None
+
+
+def discover_hwmon_sensors() -> tuple:
+    """扫描 hwmon 设备，返回 (CPU 温度文件, 风扇转速文件列表)"""
+    cpu_inputs = {}
+    fan_groups = []
+    
+    try:
+        entries = sorted(os.listdir(HWMON_DIR))
+    except OSError as e:
+        logger.debug(f"扫描 {HWMON_DIR} 失败: {e}")
+        return None, []
+    
+    for entry in entries:
+        hwmon = os.path.join(HWMON_DIR, entry)
+        try:
+            name = _read_sysfs_text(os.path.join(hwmon, "name"))
+            files = os.listdir(hwmon)
+        except OSError:
+            continue
+        
+        if name in CPU_HWMON_NAMES and name not in cpu_inputs:
+            temp_input = _find_cpu_temp_input(hwmon, files)
+            if temp_input:
+                cpu_inputs[name] = temp_input
+        
+        fans = [f for f in files if f.startswith("fan") and f.endswith("_input")]
+        if fans:
+            fans.sort(key=lambda f: (len(f), f))
+            fan_groups.append((not name.startswith(FAN_HWMON_PREFIXES), [os.path.join(hwmon, f) for f in fans]))
+    
+    cpu_temp_file = next((cpu_inputs[n] for n in CPU_HWMON_NAMES if n in cpu_inputs), None)
+    # sort 是稳定的，同优先级保持目录顺序
+    fan_groups.sort(key=lambda g: g[0])
+    fan_rpm_files = [path for _, paths in fan_groups for path in paths]
+    return cpu_temp_file, fan_rpm_files
+
+
+async def read_cpu_temp(temp_file: Optional[str] = None) -> Optional[int]:
+    """读取 CPU 温度，优先读取 hwmon 文件，未发现传感器时回退到 sensors"""
+    if temp_file:
+        value = read_sysfs_int(temp_file)
+        return value // 1000 if value is not None else None
+    
+    try:
+        returncode, stdout = await run_async(["sensors"], timeout=5)
+        if returncode == 0:
+            for line in stdout.split("\n"):
                 # 匹配常见的 CPU 温度标签
-                if any(tag in line for tag in ["Package id", "Tctl", "Tdie", "Core 0"]):
-                    match = re.search(r"[+]?(\d+(?:\.\d+)?)[°]?C", line)
+                if any(tag in line for tag in CPU_TEMP_LABELS):
+                    match = _CPU_TEMP_RE.search(line)
                     if match:
                         return int(float(match.group(1)))
     except Exception as e:
@@ -293,26 +492,62 @@ def read_cpu_temp() -> Optional[int]:
     return None
 
 
-def read_disk_temp(device: str) -> Optional[int]:
-    """读取硬盘温度"""
+# SMART 中记录温度的 ATA 属性名
+ATA_TEMP_ATTR_NAMES = ("Temperature_Celsius", "Airflow_Temperature_Cel")
+
+
+def _parse_ata_temp_text(stdout: str, attr_id: int) -> Optional[int]:
+    """从 smartctl -A 文本输出中取出指定属性的原始值（RAW_VALUE 列）"""
+    key = str(attr_id)
+    for line in stdout.split("\n"):
+        parts = line.split()
+        if len(parts) >= 10 and parts[0] == key:
+            try:
+                return int(parts[9]) % 256
+            except ValueError:
+                return None
+    return None
+
+
+async def read_disk_temp(device: str, attr_cache: Optional[Dict[str, int]] = None) -> Optional[int]:
+    """读取硬盘温度
+    
+    attr_cache 记录各 SATA 硬盘的温度属性 ID：首次通过 JSON 输出找到温度属性后写入，
+    之后只解析文本输出中的这一行，不再解码完整的 JSON。
+    """
     if not device:
         return None
     
     try:
+        attr_id = attr_cache.get(device) if attr_cache is not None else None
+        if attr_id is not None:
+            returncode, stdout = await run_async(
+                ["smartctl", "-n", "standby", "-A", f"/dev/{device}"], timeout=10
+            )
+            if returncode == 2:  # 硬盘处于待机状态
+                return None
+            if returncode == 0:
+                temp = _parse_ata_temp_text(stdout, attr_id)
+                if temp is not None:
+                    return temp
+            # 属性表发生变化，重新通过 JSON 输出查找
+            attr_cache.pop(device, None)
+        
         # 使用 standby 模式避免唤醒休眠的硬盘
-        result = run(
-            ["smartctl", "-n", "standby", "-A", f"/dev/{device}", "-j"],
-            capture_output=True, text=True, timeout=10
+        returncode, stdout = await run_async(
+            ["smartctl", "-n", "standby", "-A", f"/dev/{device}", "-j"], timeout=10
         )
-        if result.returncode in (0, 2):  # 2 表示硬盘处于待机状态
+        if returncode in (0, 2):  # 2 表示硬盘处于待机状态
             try:
-                data = json.loads(result.stdout)
+                data = json.loads(stdout)
                 
                 # SATA 硬盘
                 if "ata_smart_attributes" in data:
                     for attr in data["ata_smart_attributes"].get("table", []):
                         name = attr.get("name", "")
-                        if name in ("Temperature_Celsius", "Airflow_Temperature_Cel"):
+                        if name in ATA_TEMP_ATTR_NAMES:
+                            if attr_cache is not None and isinstance(attr.get("id"), int):
+                                attr_cache[device] = attr["id"]
                             raw = attr.get("raw", {}).get("value", 0)
                             return raw % 256
                 
@@ -328,15 +563,23 @@ def read_disk_temp(device: str) -> Optional[int]:
     return None
 
 
-def read_fan_rpm() -> Optional[int]:
+async def read_fan_rpm(rpm_files: Optional[List[str]] = None) -> Optional[int]:
     """读取风扇转速，返回第一个非零的转速值"""
+    if rpm_files:
+        for path in rpm_files:
+            rpm = read_sysfs_int(path)
+            # 跳过转速为 0 的风扇，继续查找
+            if rpm:
+                return rpm
+        return None
+    
     try:
-        result = run(["sensors"], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            for line in result.stdout.split("\n"):
+        returncode, stdout = await run_async(["sensors"], timeout=5)
+        if returncode == 0:
+            for line in stdout.split("\n"):
                 # 匹配风扇转速
-                if re.match(r"fan\d+:", line.lower()):
-                    match = re.search(r"(\d+)\s*RPM", line)
+                if _FAN_LABEL_RE.match(line):
+                    match = _FAN_RPM_RE.search(line)
                     if match:
                         rpm = int(match.group(1))
                         # 跳过转速为 0 的风扇，继续查找
@@ -349,24 +592,17 @@ def read_fan_rpm() -> Optional[int]:
 
 def read_pwm(pwm_file: str) -> Optional[int]:
     """读取当前 PWM 值"""
-    try:
-        if os.path.exists(pwm_file):
-            with open(pwm_file) as f:
-                return int(f.read().strip())
-    except Exception as e:
-        logger.debug(f"读取 PWM 失败: {e}")
-    return None
+    return read_sysfs_int(pwm_file)
 
 
 def set_pwm(pwm_file: str, value: int) -> bool:
     """设置 PWM 值"""
     try:
-        value = max(0, min(255, value))
-        if os.path.exists(pwm_file):
-            with open(pwm_file, "w") as f:
-                f.write(str(value))
-            return True
-    except Exception as e:
+        _sys_write_int(pwm_file, max(0, min(255, value)))
+        return True
+    except FileNotFoundError:
+        logger.debug(f"PWM 控制文件不存在: {pwm_file}")
+    except (OSError, TypeError, ValueError) as e:
         logger.warning(f"设置 PWM 失败: {e}")
     return False
 
@@ -408,8 +644,7 @@ def enable_manual_pwm(enable_file: str) -> bool:
             else:
                 # 如果 sudo tee 失败，尝试直接写入（可能已有足够权限）
                 try:
-                    with open(enable_file, "w") as f:
-                        f.write("1")
+                    _sys_write_int(enable_file, 1)
                     logger.info(f"通过直接写入启用 PWM 手动控制: {enable_file}")
                     return True
                 except PermissionError:
@@ -433,47 +668,85 @@ def linear_map(value: int, in_min: int, in_max: int, out_min: int, out_max: int)
     return max(out_min, min(out_max, int(result)))
 
 
-def calculate_pwm_from_curve(temp: int, curve: List[Dict[str, int]]) -> tuple:
-    """根据曲线计算 PWM 值，返回 (pwm, stage)"""
-    if not curve:
+# 曲线模式下根据 PWM 值划分阶段：低于各阈值依次为 idle / work / warning，否则为 critical
+PWM_STAGE_BOUNDS = (60, 120, 200)
+PWM_STAGE_NAMES = ("idle", "work", "warning", "critical")
+
+
+def prepare_curve(curve: List[Dict[str, int]]) -> tuple:
+    """将曲线按温度排序，拆分为 (temps, pwms) 两个元组"""
+    points = sorted(curve, key=lambda p: p["temp"])
+    return tuple(p["temp"] for p in points), tuple(p["pwm"] for p in points)
+
+
+def calc_pwm_fast(temp: int, temps: tuple, pwms: tuple) -> tuple:
+    """根据 prepare_curve 处理后的曲线计算 PWM 值，返回 (pwm, stage)"""
+    if not temps:
         return 100, "unknown"
     
-    # 按温度排序
-    sorted_curve = sorted(curve, key=lambda p: p["temp"])
-    
     # 温度低于曲线最低点
-    if temp <= sorted_curve[0]["temp"]:
-        return sorted_curve[0]["pwm"], "idle"
+    if temp <= temps[0]:
+        return pwms[0], "idle"
     
     # 温度高于曲线最高点
-    if temp >= sorted_curve[-1]["temp"]:
-        return sorted_curve[-1]["pwm"], "critical"
-    
-    # 在曲线中间，找到温度所在的区间进行线性插值
-    for i in range(len(sorted_curve) - 1):
-        p1, p2 = sorted_curve[i], sorted_curve[i + 1]
-        if p1["temp"] <= temp <= p2["temp"]:
-            pwm = linear_map(temp, p1["temp"], p2["temp"], p1["pwm"], p2["pwm"])
-            # 根据 PWM 值判断阶段
-            if pwm < 60:
-                stage = "idle"
-            elif pwm < 120:
-                stage = "work"
-            elif pwm < 200:
-                stage = "warning"
-            else:
-                stage = "critical"
-            return pwm, stage
+    if temp >= temps[-1]:
+        return pwms[-1], "critical"
     
+    # 在曲线中间，二分查找温度所在区间 (temps[i-1], temps[i]] 进行线性插值
+    i = bisect_left(temps, temp)
+    t1, p1 = temps[i - 1], pwms[i - 1]
+    pwm = p1 + (temp - t1) * (pwms[i] - p1) // (temps[i] - t1)
+    return pwm, PWM_STAGE_NAMES[bisect_right(PWM_STAGE_BOUNDS, pwm)]
+
+
+def _unknown_pwm(temp: int) -> tuple:
+    """曲线无效时使用的默认 PWM"""
     return 100, "unknown"
 
 
-def calculate_pwm(temp: int, config: FanConfig, is_cpu: bool = True) -> tuple:
-    """根据温度计算目标 PWM 值，返回 (pwm, stage)"""
+def calculate_pwm_from_curve(temp: int, curve: List[Dict[str, int]]) -> tuple:
+    """根据曲线计算 PWM 值，返回 (pwm, stage)"""
+    return calc_pwm_fast(temp, *prepare_curve(curve))
+
+
+# 曲线温度跨度不超过该值时预先生成逐度查找表
+CURVE_LUT_MAX_SPAN = 256
+
+
+def make_curve_pwm_fn(temps: tuple, pwms: tuple) -> Callable[[int], tuple]:
+    """生成曲线模式的 PWM 计算函数
+    
+    温度均为整数，曲线范围内逐度预先算好 (pwm, stage)，运行时只需一次元组索引；
+    非整数温度或跨度过大的曲线仍使用 calc_pwm_fast。
+    """
+    if not temps:
+        return _unknown_pwm
+    
+    lo, hi = temps[0], temps[-1]
+    if not (isinstance(lo, int) and isinstance(hi, int) and hi - lo <= CURVE_LUT_MAX_SPAN):
+        return lambda temp: calc_pwm_fast(temp, temps, pwms)
+    
+    table = tuple(calc_pwm_fast(t, temps, pwms) for t in range(lo, hi + 1))
+    # 高于曲线最高点时与 calc_pwm_fast 一致为 critical（单点曲线时 table[-1] 是 idle，不能直接使用）
+    first, last = table[0], (pwms[-1], "critical")
+    
+    def curve_pwm(temp: int) -> tuple:
+        if temp <= lo:
+            return first
+        if temp >= hi:
+            return last
+        if type(temp) is int:
+            return table[temp - lo]
+        return calc_pwm_fast(temp, temps, pwms)
+    
+    return curve_pwm
+
+
+def make_pwm_fn(config: FanConfig, is_cpu: bool = True) -> Callable[[int], tuple]:
+    """根据配置生成 temp -> (pwm, stage) 的计算函数，曲线和阈值在生成时固定"""
     # 曲线模式
     if config.use_curve_mode:
-        curve = config.cpu_curve if is_cpu else config.disk_curve
-        return calculate_pwm_from_curve(temp, curve)
+        return make_curve_pwm_fn(*prepare_curve(config.cpu_curve if is_cpu else config.disk_curve))
     
     # 旧阈值模式（向后兼容）
     if is_cpu:
@@ -487,26 +760,100 @@ def calculate_pwm(temp: int, config: FanConfig, is_cpu: bool = True) -> tuple:
         warning_max = config.disk_warning_temp_max
         critical_max = config.disk_critical_temp_max
     
-    if temp < idle_max:
-        pwm = linear_map(temp, idle_min, idle_max, config.idle_pwm_min, config.idle_pwm_max)
-        return pwm, "idle"
-    elif temp < work_max:
-        pwm = linear_map(temp, idle_max, work_max, config.work_pwm_min, config.work_pwm_max)
-        return pwm, "work"
-    elif temp < warning_max:
-        pwm = linear_map(temp, work_max, warning_max, config.warning_pwm_min, config.warning_pwm_max)
-        return pwm, "warning"
-    elif temp < critical_max:
-        pwm = linear_map(temp, warning_max, critical_max, config.critical_pwm_min, config.critical_pwm_max)
-        return pwm, "critical"
-    else:
-        return config.critical_pwm_max, "emergency"
+    idle_pwm = (config.idle_pwm_min, config.idle_pwm_max)
+    work_pwm = (config.work_pwm_min, config.work_pwm_max)
+    warning_pwm = (config.warning_pwm_min, config.warning_pwm_max)
+    critical_pwm = (config.critical_pwm_min, config.critical_pwm_max)
+    
+    def threshold_pwm(temp: int) -> tuple:
+        if temp < idle_max:
+            return linear_map(temp, idle_min, idle_max, *idle_pwm), "idle"
+        elif temp < work_max:
+            return linear_map(temp, idle_max, work_max, *work_pwm), "work"
+        elif temp < warning_max:
+            return linear_map(temp, work_max, warning_max, *warning_pwm), "warning"
+        elif temp < critical_max:
+            return linear_map(temp, warning_max, critical_max, *critical_pwm), "critical"
+        else:
+            return critical_pwm[1], "emergency"
+    
+    return threshold_pwm
+
+
+def calculate_pwm(temp: int, config: FanConfig, is_cpu: bool = True) -> tuple:
+    """根据温度计算目标 PWM 值，返回 (pwm, stage)"""
+    return make_pwm_fn(config, is_cpu)(temp)
 
 
 ###############################################################################
 # 风扇控制引擎
 ###############################################################################
 
+# 两次传感器采集的最小间隔（秒），与前端允许的最小检测间隔一致
+MIN_POLL_INTERVAL = 0.5
+
+# 同时运行的硬盘温度读取（smartctl）数量上限
+MAX_DISK_READ_WORKERS = 8
+
+# 自适应检测间隔：温度平稳且处于低负载阶段时逐步放大间隔，温度变化时恢复配置值
+ADAPTIVE_INTERVAL_MAX = 30.0
+ADAPTIVE_INTERVAL_FACTOR = 1.5
+ADAPTIVE_STABLE_SPREAD = 2
+ADAPTIVE_STABLE_STAGES = ("idle", "work")
+# 由硬盘温度决定风扇转速时，间隔最多放大到该值（秒）
+ADAPTIVE_INTERVAL_DISK_MAX = 10.0
+
+
+class RunningAvg:
+    """定长温度历史，增量维护有效温度（> 0）的总和与个数"""
+    
+    def __init__(self, size: int, values=()):
+        self.values: deque = deque(maxlen=size)
+        self.total = 0
+        self.count = 0
+        for value in values:
+            self.push(value)
+    
+    @property
+    def maxlen(self) -> int:
+        return self.values.maxlen
+    
+    def __iter__(self):
+        return iter(self.values)
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def push(self, value: int) -> None:
+        """追加温度，历史已满时淘汰最旧的记录"""
+        values = self.values
+        if values and len(values) == values.maxlen:
+            oldest = values[0]
+            if oldest > 0:
+                self.total -= oldest
+                self.count -= 1
+        values.append(value)
+        if value > 0 and values.maxlen:
+            self.total += value
+            self.count += 1
+    
+    def clear(self) -> None:
+        self.values.clear()
+        self.total = 0
+        self.count = 0
+    
+    def spread(self) -> Optional[int]:
+        """历史已满时返回最高与最低温度之差，否则返回 None"""
+        values = self.values
+        if not values or len(values) < values.maxlen:
+            return None
+        return max(values) - min(values)
+    
+    def avg(self) -> Optional[int]:
+        """有效温度的平均值，没有有效温度时返回 None"""
+        return self.total // self.count if self.count else None
+
+
 class FanController:
     """风扇控制器"""
     
@@ -518,16 +865,43 @@ class FanController:
         else:
             self.config = FanConfig()
         
+        # 控制循环与 HTTP 服务运行在同一个事件循环中，状态只在该线程内读写，无需加锁
         self.running = False
-        self.thread: Optional[threading.Thread] = None
-        self.lock = threading.RLock()
+        self.task: Optional[asyncio.Task] = None
+        # 序列化后的配置（配置变更时清空）
+        self._config_json_cache: Optional[bytes] = None
+        # 序列化后的状态（状态更新时清空）
+        self._status_json_cache: Optional[bytes] = None
+        # 停止信号，stop() 置位后控制循环立即结束等待
+        self._stop_event = asyncio.Event()
+        # 保证同一时间只有一次传感器采集
+        self._sensor_lock = asyncio.Lock()
+        # 串行化配置文件写入
+        self._save_lock = asyncio.Lock()
+        # 限制并发的 smartctl 进程数
+        self._disk_read_sem = asyncio.Semaphore(MAX_DISK_READ_WORKERS)
+        # 各硬盘的 SMART 温度属性 ID（设备名 -> 属性 ID）
+        self._disk_temp_attr: Dict[str, int] = {}
+        # 上次传感器采集完成的时间（time.monotonic）
+        self.status_mtime: float = 0.0
+        # 当前检测间隔（秒），温度平稳时会在 check_interval 基础上放大
+        self._current_interval: float = self.config.check_interval
+        # 开始放大间隔时的硬盘最高平均温度，用于发现缓慢升温
+        self._stable_disk_ref: Optional[int] = None
         
         # 硬盘列表
         self.disks: List[DiskInfo] = []
+        # 控制循环使用的按列存储的硬盘数据，与 self.disks 一一对应
+        self._disk_ids: List[str] = []
+        self._disk_devices: List[str] = []
+        self._disk_active: List[bool] = []
+        self._disk_temps: List[Optional[int]] = []
         
-        # 温度历史（内存存储）
-        self.cpu_temp_history: List[int] = []
-        self.disk_temp_history: Dict[str, List[int]] = {}
+        # 温度历史（内存存储），超出 temp_history_size 时自动丢弃最旧的记录
+        self.cpu_temp_history = RunningAvg(self.config.temp_history_size)
+        self.disk_temp_history: Dict[str, RunningAvg] = defaultdict(
+            lambda: RunningAvg(self.config.temp_history_size)
+        )
         
         # 预热计数
         self.warmup_counter = 0
@@ -537,6 +911,18 @@ class FanController:
         self.last_alert_time_cpu: float = 0
         self.last_alert_time_disk: Dict[str, float] = {}
         
+        # push 命令路径，更新配置时重新查找（支持运行期间安装 push）
+        self._push_path: Optional[str] = shutil.which("push")
+        
+        # temp -> (pwm, stage) 计算函数（配置变更时重新生成）
+        self._cpu_pwm_fn: Callable[[int], tuple] = _unknown_pwm
+        self._disk_pwm_fn: Callable[[int], tuple] = _unknown_pwm
+        self._recompute_curves()
+        
+        # hwmon 传感器文件（启动时发现）
+        self.cpu_temp_file: Optional[str] = None
+        self.fan_rpm_files: List[str] = []
+        
         # 当前状态
         self.status = {
             "cpu_temp": None,
@@ -554,140 +940,215 @@ class FanController:
             "last_update": None,
         }
     
-    def _save_config(self) -> None:
-        """保存配置到文件"""
-        if self.config_path:
-            self.config.save(self.config_path)
+    async def _save_config(self) -> None:
+        """保存配置到文件：在事件循环中取快照，写文件放到线程中执行，不阻塞 API 和控制循环"""
+        if not self.config_path:
+            return
+        # 串行化写入，保证较新的快照最后写入
+        async with self._save_lock:
+            await asyncio.to_thread(FanConfig.save_dict, self.config_path, self.config.to_dict())
+    
+    def _recompute_curves(self) -> None:
+        """根据当前配置重新生成 CPU / 硬盘的 PWM 计算函数"""
+        try:
+            self._cpu_pwm_fn = make_pwm_fn(self.config, is_cpu=True)
+            self._disk_pwm_fn = make_pwm_fn(self.config, is_cpu=False)
+        except (KeyError, TypeError) as e:
+            logger.warning(f"风扇曲线配置无效: {e}")
+            self._cpu_pwm_fn = self._disk_pwm_fn = _unknown_pwm
+    
+    def _resize_histories(self) -> None:
+        """temp_history_size 变化时重建温度历史，保留最近的记录"""
+        size = self.config.temp_history_size
+        if self.cpu_temp_history.maxlen == size:
+            return
+        self.cpu_temp_history = RunningAvg(size, self.cpu_temp_history)
+        for disk_id, history in self.disk_temp_history.items():
+            self.disk_temp_history[disk_id] = RunningAvg(size, history)
     
-    def detect_disks(self) -> None:
+    def discover_sensors(self) -> None:
+        """发现 hwmon 温度和转速传感器"""
+        self.cpu_temp_file, self.fan_rpm_files = discover_hwmon_sensors()
+        if self.cpu_temp_file:
+            logger.info(f"CPU 温度传感器: {self.cpu_temp_file}")
+        else:
+            logger.warning("未找到 CPU hwmon 温度传感器，使用 sensors 读取")
+        if self.fan_rpm_files:
+            logger.info(f"风扇转速传感器: {', '.join(self.fan_rpm_files)}")
+        else:
+            logger.warning("未找到 hwmon 风扇转速传感器，使用 sensors 读取")
+    
+    async def detect_disks(self) -> None:
         """检测所有硬盘"""
-        with self.lock:
-            self.disks = detect_all_disks()
-            # 保留用户之前的选择
-            active_ids = set(self.config.active_disks)
-            for disk in self.disks:
-                disk.active = disk.id in active_ids
-            logger.info(f"检测到 {len(self.disks)} 个硬盘")
+        disks = await detect_all_disks()
+        self.disks = disks
+        # 设备名可能已变化，重新查找温度属性
+        self._disk_temp_attr.clear()
+        # 保留用户之前的选择
+        active_ids = set(self.config.active_disks)
+        for disk in self.disks:
+            disk.active = disk.id in active_ids
+        self._rebuild_disk_arrays()
+        logger.info(f"检测到 {len(self.disks)} 个硬盘")
+    
+    def _rebuild_disk_arrays(self) -> None:
+        """根据 self.disks 重建按列存储的硬盘数据，保留仍存在的硬盘的当前温度"""
+        disks = self.disks
+        temps = dict(zip(self._disk_ids, self._disk_temps))
+        self._disk_ids = [disk.id for disk in disks]
+        self._disk_devices = [disk.device for disk in disks]
+        self._disk_active = [disk.active for disk in disks]
+        self._disk_temps = [temps.get(disk.id) for disk in disks]
     
     def get_disks(self) -> List[Dict[str, Any]]:
         """获取硬盘列表"""
-        with self.lock:
-            result = []
-            for disk in self.disks:
-                d = {
-                    "id": disk.id,
-                    "device": disk.device,
-                    "path": disk.path,
-                    "model": disk.model,
-                    "serial": disk.serial,
-                    "size": disk.size,
-                    "type": disk.disk_type,
-                    "temp": disk.temp,
-                    "active": disk.active,
-                }
-                result.append(d)
-            return result
-    
-    def set_active_disks(self, disk_ids: List[str]) -> None:
+        result = []
+        for disk, temp in zip(self.disks, self._disk_temps):
+            d = {
+                "id": disk.id,
+                "device": disk.device,
+                "path": disk.path,
+                "model": disk.model,
+                "serial": disk.serial,
+                "size": disk.size,
+                "type": disk.disk_type,
+                "temp": temp,
+                "active": disk.active,
+            }
+            result.append(d)
+        return result
+    
+    async def set_active_disks(self, disk_ids: List[str]) -> None:
         """设置参与调速的硬盘"""
-        with self.lock:
-            self.config.active_disks = disk_ids
-            for disk in self.disks:
-                disk.active = disk.id in disk_ids
-        self._save_config()
+        self.config.active_disks = disk_ids
+        self._config_json_cache = None
+        for disk in self.disks:
+            disk.active = disk.id in disk_ids
+        self._rebuild_disk_arrays()
+        await self._save_config()
     
-    def update_config(self, data: Dict[str, Any]) -> None:
+    async def update_config(self, data: Dict[str, Any]) -> None:
         """更新配置"""
-        with self.lock:
-            self.config.update(data)
-        self._save_config()
+        self.config.update(data)
+        self._config_json_cache = None
+        self._recompute_curves()
+        self._resize_histories()
+        self._push_path = shutil.which("push")
+        self._current_interval = self.config.check_interval
+        await self._save_config()
+    
+    def set_enabled(self, enabled: bool) -> None:
+        """启用/禁用自动控制"""
+        self.config.enabled = enabled
+        self._config_json_cache = None
     
     def get_config(self) -> Dict[str, Any]:
         """获取配置"""
-        with self.lock:
-            return self.config.to_dict()
+        return self.config.to_dict()
+    
+    def get_config_json(self) -> bytes:
+        """获取 JSON 序列化后的配置，结果缓存到下次配置变更"""
+        if self._config_json_cache is None:
+            self._config_json_cache = _dumps(self.config.to_dict())
+        return self._config_json_cache
     
     def get_status(self) -> Dict[str, Any]:
         """获取状态"""
-        with self.lock:
-            return dict(self.status)
+        return dict(self.status)
     
-    def _calc_avg(self, history: List[int]) -> Optional[int]:
-        """计算平均值"""
-        valid = [t for t in history if t is not None and t > 0]
-        return sum(valid) // len(valid) if valid else None
+    def get_status_json(self) -> bytes:
+        """获取 JSON 序列化后的状态，结果缓存到下次状态更新"""
+        if self._status_json_cache is None:
+            self._status_json_cache = _dumps(self.status)
+        return self._status_json_cache
     
-    def _read_temps(self) -> None:
+    def _publish_status(self, **fields: Any) -> None:
+        """生成新的状态字典并整体替换（已发布的状态字典不再修改）"""
+        self.status = {**self.status, **fields}
+        self._status_json_cache = None
+    
+    async def _poll_sensors(self) -> None:
+        """采集一次传感器数据并更新缓存状态，HTTP 接口只读取缓存"""
+        async with self._sensor_lock:
+            if time.monotonic() - self.status_mtime < MIN_POLL_INTERVAL:
+                return
+            await self._read_temps()
+            self.status_mtime = time.monotonic()
+    
+    async def _read_disk_temp(self, device: str) -> Optional[int]:
+        """读取硬盘温度，并发数受 MAX_DISK_READ_WORKERS 限制"""
+        async with self._disk_read_sem:
+            return await read_disk_temp(device, self._disk_temp_attr)
+    
+    async def _read_temps(self) -> None:
         """读取所有温度"""
-        history_size = self.config.temp_history_size
+        ids, devices, active = self._disk_ids, self._disk_devices, self._disk_active
+        
+        # 并发读取 CPU、风扇和各硬盘传感器
+        cpu_temp, fan_rpm, *temps = await asyncio.gather(
+            read_cpu_temp(self.cpu_temp_file),
+            read_fan_rpm(self.fan_rpm_files),
+            *(self._read_disk_temp(device) for device in devices),
+        )
         
         # CPU 温度
-        cpu_temp = read_cpu_temp()
         if cpu_temp is not None:
-            self.cpu_temp_history.append(cpu_temp)
-            while len(self.cpu_temp_history) > history_size:
-                self.cpu_temp_history.pop(0)
+            self.cpu_temp_history.push(cpu_temp)
         
-        cpu_avg = self._calc_avg(self.cpu_temp_history)
+        cpu_avg = self.cpu_temp_history.avg()
         
         # 硬盘温度
-        disk_temps = {}
-        disk_avg_temps = {}
-        max_disk_temp = None
-        
-        for disk in self.disks:
-            temp = read_disk_temp(disk.device)
-            disk.temp = temp
-            disk_temps[disk.id] = temp
-            
-            if disk.id not in self.disk_temp_history:
-                self.disk_temp_history[disk.id] = []
-            
+        disk_temp_history = self.disk_temp_history
+        avgs = []
+        for disk_id, temp in zip(ids, temps):
+            history = disk_temp_history[disk_id]
             if temp is not None:
-                self.disk_temp_history[disk.id].append(temp)
-                while len(self.disk_temp_history[disk.id]) > history_size:
-                    self.disk_temp_history[disk.id].pop(0)
+                history.push(temp)
             else:
                 # 硬盘休眠或读取失败时，清空历史记录
-                self.disk_temp_history[disk.id].clear()
-            
-            avg = self._calc_avg(self.disk_temp_history.get(disk.id, []))
-            disk_avg_temps[disk.id] = avg
-            
-            # 只计算激活的硬盘的最高温度
-            if disk.active and avg is not None:
-                if max_disk_temp is None or avg > max_disk_temp:
-                    max_disk_temp = avg
+                history.clear()
+            avgs.append(history.avg())
+        
+        # 只计算激活的硬盘的最高温度
+        max_disk_temp = max(
+            (avg for avg, is_active in zip(avgs, active) if is_active and avg is not None),
+            default=None,
+        )
+        disk_temps = dict(zip(ids, temps))
+        disk_avg_temps = dict(zip(ids, avgs))
         
         # 风扇状态
-        fan_rpm = read_fan_rpm()
         current_pwm = read_pwm(self.config.pwm_control_file)
         
         # 更新状态
-        with self.lock:
-            self.status["cpu_temp"] = cpu_temp
-            self.status["cpu_avg_temp"] = cpu_avg
-            self.status["disk_temps"] = disk_temps
-            self.status["disk_avg_temps"] = disk_avg_temps
-            self.status["max_disk_temp"] = max_disk_temp
-            self.status["fan_rpm"] = fan_rpm
-            self.status["current_pwm"] = current_pwm
-            self.status["last_update"] = datetime.now().isoformat()
-    
-    def _control_cycle(self) -> None:
+        # 读取期间硬盘列表可能已重新检测，此时丢弃本次的硬盘温度
+        if self._disk_ids is ids:
+            self._disk_temps = temps
+        self._publish_status(
+            cpu_temp=cpu_temp,
+            cpu_avg_temp=cpu_avg,
+            disk_temps=disk_temps,
+            disk_avg_temps=disk_avg_temps,
+            max_disk_temp=max_disk_temp,
+            fan_rpm=fan_rpm,
+            current_pwm=current_pwm,
+            last_update=datetime.now().isoformat(),
+        )
+    
+    async def _control_cycle(self) -> None:
         """单次控制循环"""
-        self._read_temps()
+        await self._poll_sensors()
         
         # 预热阶段
         if not self.is_warmed_up:
             self.warmup_counter += 1
-            with self.lock:
-                self.status["warmup_progress"] = min(100, int(self.warmup_counter / self.config.temp_history_size * 100))
+            self._publish_status(
+                warmup_progress=min(100, int(self.warmup_counter / self.config.temp_history_size * 100))
+            )
             
             if self.warmup_counter >= self.config.temp_history_size:
                 self.is_warmed_up = True
-                with self.lock:
-                    self.status["is_warmed_up"] = True
+                self._publish_status(is_warmed_up=True)
                 logger.info("预热完成，开始控制风扇")
             else:
                 logger.info(f"预热中 {self.warmup_counter}/{self.config.temp_history_size}")
@@ -708,10 +1169,7 @@ class FanController:
         if not has_cpu_temp and not has_disk_temp:
             safe_pwm = 128
             logger.warning("所有温度数据不可用，使用安全PWM值")
-            with self.lock:
-                self.status["target_pwm"] = safe_pwm
-                self.status["trigger_source"] = "Safety"
-                self.status["trigger_stage"] = "warning"
+            self._publish_status(target_pwm=safe_pwm, trigger_source="Safety", trigger_stage="warning")
             if current_pwm != safe_pwm:
                 set_pwm(self.config.pwm_control_file, safe_pwm)
             return
@@ -721,10 +1179,10 @@ class FanController:
         disk_pwm, disk_stage = (0, "")
         
         if has_cpu_temp:
-            cpu_pwm, cpu_stage = calculate_pwm(cpu_avg, self.config, is_cpu=True)
+            cpu_pwm, cpu_stage = self._cpu_pwm_fn(cpu_avg)
         
         if has_disk_temp:
-            disk_pwm, disk_stage = calculate_pwm(max_disk, self.config, is_cpu=False)
+            disk_pwm, disk_stage = self._disk_pwm_fn(max_disk)
         
         # 取较大值
         if cpu_pwm >= disk_pwm:
@@ -747,10 +1205,7 @@ class FanController:
             set_pwm(self.config.pwm_control_file, target_pwm)
         
         # 更新状态
-        with self.lock:
-            self.status["target_pwm"] = target_pwm
-            self.status["trigger_source"] = trigger_source
-            self.status["trigger_stage"] = trigger_stage
+        self._publish_status(target_pwm=target_pwm, trigger_source=trigger_source, trigger_stage=trigger_stage)
         
         # 温度告警检查
         self._check_temp_alert()
@@ -789,15 +1244,13 @@ class FanController:
     
     def _send_push(self, message: str) -> None:
         """发送推送消息（后台执行，不阻塞）"""
+        if self._push_path is None:
+            return
+        
         try:
-            # 检查 push 命令是否存在
-            result = run(["which", "push"], capture_output=True)
-            if result.returncode != 0:
-                return
-            
             # 后台执行，不等待结果
             Popen(
-                ["push", message],
+                [self._push_path, message],
                 stdout=DEVNULL,
                 stderr=DEVNULL,
                 start_new_session=True  # 避免僵尸进程
@@ -806,40 +1259,83 @@ class FanController:
         except Exception as e:
             logger.debug(f"推送失败: {e}")
     
-    def _run_loop(self) -> None:
+    async def _run_loop(self) -> None:
         """控制循环"""
         # 初始化前置处理
         logger.info("执行风扇控制前置处理...")
-        load_it87_module()
-        enable_manual_pwm(self.config.pwm_enable_file)
+        # modprobe / sudo tee 可能耗时数秒，放到线程中执行，避免阻塞共用事件循环的 HTTP 服务
+        await asyncio.to_thread(load_it87_module)
+        await asyncio.to_thread(enable_manual_pwm, self.config.pwm_enable_file)
+        
+        # it87 模块加载后再发现传感器
+        self.discover_sensors()
         
         # 检测硬盘
-        self.detect_disks()
+        await self.detect_disks()
         
         while self.running:
             try:
-                self._control_cycle()
+                await self._control_cycle()
             except Exception as e:
                 logger.exception(f"控制循环异常: {e}")
             
-            time.sleep(self.config.check_interval)
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), self._next_interval())
+                break
+            except asyncio.TimeoutError:
+                pass
+    
+    def _next_interval(self) -> float:
+        """根据 CPU 和硬盘温度变化计算下一次检测间隔"""
+        base = self.config.check_interval
+        spread = self.cpu_temp_history.spread()
+        max_disk = self.status.get("max_disk_temp")
+        # 硬盘最高平均温度与开始放大间隔时相比的变化（硬盘持续升温时 CPU 可能保持平稳）
+        disk_stable = (
+            max_disk is None
+            or self._stable_disk_ref is None
+            or abs(max_disk - self._stable_disk_ref) < ADAPTIVE_STABLE_SPREAD
+        )
+        stable = (
+            self.is_warmed_up
+            and spread is not None
+            and spread < ADAPTIVE_STABLE_SPREAD
+            and disk_stable
+            and self.status.get("trigger_stage") in ADAPTIVE_STABLE_STAGES
+        )
+        if stable:
+            if self._stable_disk_ref is None:
+                self._stable_disk_ref = max_disk
+            limit = ADAPTIVE_INTERVAL_DISK_MAX if self.status.get("trigger_source") == "Disk" else ADAPTIVE_INTERVAL_MAX
+            self._current_interval = min(max(base, limit), self._current_interval * ADAPTIVE_INTERVAL_FACTOR)
+        else:
+            self._current_interval = base
+            self._stable_disk_ref = max_disk
+        return self._current_interval
     
     def start(self) -> None:
-        """启动"""
+        """启动（需在事件循环中调用）"""
         if self.running:
             return
         self.running = True
         self.warmup_counter = 0
         self.is_warmed_up = False
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
-        self.thread.start()
+        self._stop_event.clear()
+        self.task = asyncio.create_task(self._run_loop())
         logger.info("风扇控制器已启动")
     
-    def stop(self) -> None:
+    async def stop(self) -> None:
         """停止"""
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=5)
+        self._stop_event.set()
+        if self.task:
+            try:
+                await asyncio.wait_for(self.task, 5)
+            except asyncio.TimeoutError:
+                logger.warning("控制循环未能在 5 秒内退出")
+            except Exception as e:
+                logger.exception(f"控制循环异常退出: {e}")
+            self.task = None
         logger.info("风扇控制器已停止")
     
     def set_manual_pwm(self, value: int) -> bool:
@@ -847,8 +1343,7 @@ class FanController:
         return set_pwm(self.config.pwm_control_file, value)
     
     def refresh(self) -> Dict[str, Any]:
-        """立即刷新状态"""
-        self._read_temps()
+        """返回最新状态（由控制循环定时采集，不直接读取硬件）"""
         return self.get_status()
 
 
@@ -859,193 +1354,306 @@ class FanController:
 # 全局控制器实例
 controller: Optional[FanController] = None
 
+# 单个请求允许的最大请求头数量和请求体大小
+MAX_HEADER_COUNT = 100
+MAX_BODY_SIZE = 1024 * 1024
+
+# 长连接空闲超时（秒）
+KEEPALIVE_TIMEOUT = 30
+
+# 未指定监听地址时（Linux）使用的抽象命名空间 Unix socket，不在文件系统中创建文件
+DEFAULT_ABSTRACT_SOCKET = "\0fn-fan.sock"
+
+_PEERCRED_STRUCT = struct.Struct("3i")
 
-class APIHandler(BaseHTTPRequestHandler):
-    """API 请求处理"""
+
+def _is_abstract_socket(path: Optional[str]) -> bool:
+    return bool(path) and path[0] == "\0"
+
+
+class APIHandler:
+    """API 请求处理（每个连接一个实例，与控制循环共用同一个事件循环）"""
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.method = ""
+        self.path = ""
+        self.headers: Dict[str, str] = {}
+        self.body = b""
+        self.close_connection = True
     
-    def log_message(self, format, *args):
-        # Unix socket 下 client_address 可能是空字符串，需要特殊处理
-        ca = getattr(self, "client_address", None)
-        if isinstance(ca, (list, tuple)) and ca:
-            addr = ca[0]
+    @classmethod
+    async def serve_connection(cls, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """asyncio 服务器的连接回调"""
+        handler = cls(reader, writer)
+        try:
+            if not handler._peer_allowed():
+                return
+            await handler.handle()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.exception(f"处理连接出错: {e}")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+    
+    def _peer_allowed(self) -> bool:
+        """抽象命名空间 socket 没有文件权限保护，通过 SO_PEERCRED 只允许 root 和本服务用户连接"""
+        sock = self.writer.get_extra_info("socket")
+        if sock is None or sock.family != socket.AF_UNIX:
+            return True
+        name = sock.getsockname()
+        if not _is_abstract_socket(name.decode("latin-1") if isinstance(name, bytes) else name):
+            return True
+        pid, uid, gid = _PEERCRED_STRUCT.unpack(
+            sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED_STRUCT.size)
+        )
+        if uid in (0, os.getuid()):
+            return True
+        logger.warning(f"拒绝来自 uid={uid} (pid={pid}) 的连接")
+        return False
+    
+    async def handle(self) -> None:
+        """依次处理连接上的请求，直到客户端关闭或不再保持连接"""
+        while True:
+            try:
+                if not await asyncio.wait_for(self._parse_request(), KEEPALIVE_TIMEOUT):
+                    return
+            except asyncio.TimeoutError:
+                return
+            except ValueError as e:
+                self.close_connection = True
+                self._json_response({"error": f"bad request: {e}"}, 400)
+                await self.writer.drain()
+                return
+            
+            logger.debug(f"{self.method} {self.path}")
+            if self.method == "OPTIONS":
+                self._send_options()
+            else:
+                await self._handle_request(self.method)
+            await self.writer.drain()
+            
+            if self.close_connection:
+                return
+    
+    async def _parse_request(self) -> bool:
+        """读取并解析一个请求，连接已关闭时返回 False，格式错误时抛出 ValueError"""
+        line = await self.reader.readline()
+        if not line:
+            return False
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise ValueError("invalid request line")
+        self.method, self.path, version = parts
+        
+        headers = {}
+        for _ in range(MAX_HEADER_COUNT):
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, sep, value = line.decode("latin-1").partition(":")
+            if not sep:
+                raise ValueError("invalid header")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise ValueError("too many headers")
+        self.headers = headers
+        
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            self.close_connection = connection == "close"
         else:
-            addr = ca or "-"
-        logger.debug(f"{addr} - {format % args}")
+            self.close_connection = connection != "keep-alive"
+        
+        length = int(headers.get("content-length") or 0)
+        if length < 0 or length > MAX_BODY_SIZE:
+            raise ValueError("invalid content length")
+        if length and headers.get("expect", "").lower() == "100-continue":
+            self.writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        self.body = await self.reader.readexactly(length) if length else b""
+        return True
+    
+    def _send(self, status: int, headers: bytes, body: bytes = b"") -> None:
+        """组装完整响应后一次写出"""
+        self.writer.write(b"".join((
+            b"HTTP/1.1 %d %s\r\n" % (status, HTTPStatus(status).phrase.encode("latin-1")),
+            headers,
+            b"Access-Control-Allow-Origin: *\r\n",
+            b"Content-Length: %d\r\n" % len(body),
+            b"Connection: close\r\n\r\n" if self.close_connection else b"Connection: keep-alive\r\n\r\n",
+            body,
+        )))
     
     def _json_response(self, data: Any, status: int = 200) -> None:
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        self._send_json_bytes(_dumps(data), status)
+    
+    def _send_json_bytes(self, body: bytes, status: int = 200) -> None:
+        self._send(status, b"Content-Type: application/json; charset=utf-8\r\n", body)
+    
+    def _send_options(self) -> None:
+        self._send(200, (
+            b"Access-Control-Allow-Methods: GET, POST, PUT, DELETE, OPTIONS\r\n"
+            b"Access-Control-Allow-Headers: Content-Type\r\n"
+        ))
     
     def _read_json(self) -> Optional[Dict]:
         try:
-            length = int(self.headers.get("Content-Length", 0))
-            if length > 0:
-                body = self.rfile.read(length)
-                return json.loads(body.decode("utf-8"))
+            if self.body:
+                return json.loads(self.body.decode("utf-8"))
         except Exception as e:
             logger.warning(f"解析 JSON 失败: {e}")
         return {}
     
-    def do_OPTIONS(self):
-        self.send_response(200)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
-        self.end_headers()
-    
-    def do_GET(self):
-        self._handle_request("GET")
-    
-    def do_POST(self):
-        self._handle_request("POST")
-    
-    def do_PUT(self):
-        self._handle_request("PUT")
-    
-    def _handle_request(self, method: str) -> None:
+    async def _handle_request(self, method: str) -> None:
         global controller
         if controller is None:
             self._json_response({"error": "controller not initialized"}, 500)
             return
         
-        parsed = urlparse(self.path)
-        path = parsed.path.rstrip("/")
-        
-        try:
-            # GET /api/status - 获取状态
-            if path == "/api/status" and method == "GET":
-                self._json_response({
-                    "status": controller.get_status(),
-                    "enabled": controller.config.enabled,
-                })
-                return
-            
-            # GET /api/config - 获取配置
-            if path == "/api/config" and method == "GET":
-                self._json_response({"config": controller.get_config()})
-                return
-            
-            # PUT /api/config - 更新配置
-            if path == "/api/config" and method == "PUT":
-                data = self._read_json()
-                controller.update_config(data)
-                self._json_response({"success": True, "config": controller.get_config()})
-                return
-            
-            # GET /api/disks - 获取硬盘列表
-            if path == "/api/disks" and method == "GET":
-                self._json_response({"disks": controller.get_disks()})
-                return
-            
-            # POST /api/disks/refresh - 刷新硬盘列表
-            if path == "/api/disks/refresh" and method == "POST":
-                controller.detect_disks()
-                self._json_response({"disks": controller.get_disks()})
-                return
-            
-            # PUT /api/disks/active - 设置激活的硬盘
-            if path == "/api/disks/active" and method == "PUT":
-                data = self._read_json()
-                disk_ids = data.get("disk_ids", [])
-                controller.set_active_disks(disk_ids)
-                self._json_response({"success": True, "active_disks": disk_ids})
-                return
-            
-            # POST /api/control/pwm - 手动设置 PWM
-            if path == "/api/control/pwm" and method == "POST":
-                data = self._read_json()
-                pwm = int(data.get("pwm", 0))
-                success = controller.set_manual_pwm(pwm)
-                self._json_response({"success": success, "pwm": pwm})
-                return
-            
-            # POST /api/control/toggle - 启用/禁用自动控制
-            if path == "/api/control/toggle" and method == "POST":
-                data = self._read_json()
-                enabled = data.get("enabled", True)
-                controller.config.enabled = bool(enabled)
-                self._json_response({"success": True, "enabled": controller.config.enabled})
-                return
-            
-            # POST /api/refresh - 刷新状态
-            if path == "/api/refresh" and method == "POST":
-                status = controller.refresh()
-                self._json_response({"status": status})
-                return
-            
+        path = urlparse(self.path).path.rstrip("/")
+        handler = self.ROUTES.get((method, path))
+        if handler is None:
             self._json_response({"error": "not found"}, 404)
+            return
         
+        try:
+            await handler(self, controller)
         except Exception as e:
             logger.exception(f"API 错误: {e}")
             self._json_response({"error": str(e)}, 500)
-
-
-def run_server(host: str = "0.0.0.0", port: int = 28257, unix_socket: str = None, config_path: str = None):
-    """运行 HTTP 服务"""
-    global controller
     
-    # 如果没有指定配置文件路径，根据 unix_socket 路径自动推断
-    if not config_path and unix_socket:
-        config_path = os.path.join(os.path.dirname(unix_socket), "config.json")
+    async def _handle_status(self, ctl: FanController) -> None:
+        """GET /api/status - 获取状态"""
+        self._send_json_bytes(b'{"status":%s,"enabled":%s}' % (
+            ctl.get_status_json(),
+            b"true" if ctl.config.enabled else b"false",
+        ))
     
-    controller = FanController(config_path=config_path)
-    controller.start()
+    async def _handle_config_get(self, ctl: FanController) -> None:
+        """GET /api/config - 获取配置"""
+        self._send_json_bytes(b'{"config":%s}' % ctl.get_config_json())
+    
+    async def _handle_config_put(self, ctl: FanController) -> None:
+        """PUT /api/config - 更新配置"""
+        data = self._read_json()
+        await ctl.update_config(data)
+        self._json_response({"success": True, "config": ctl.get_config()})
     
+    async def _handle_disks(self, ctl: FanController) -> None:
+        """GET /api/disks - 获取硬盘列表"""
+        self._json_response({"disks": ctl.get_disks()})
+    
+    async def _handle_disks_refresh(self, ctl: FanController) -> None:
+        """POST /api/disks/refresh - 刷新硬盘列表"""
+        await ctl.detect_disks()
+        self._json_response({"disks": ctl.get_disks()})
+    
+    async def _handle_disks_active(self, ctl: FanController) -> None:
+        """PUT /api/disks/active - 设置激活的硬盘"""
+        data = self._read_json()
+        disk_ids = data.get("disk_ids", [])
+        await ctl.set_active_disks(disk_ids)
+        self._json_response({"success": True, "active_disks": disk_ids})
+    
+    async def _handle_control_pwm(self, ctl: FanController) -> None:
+        """POST /api/control/pwm - 手动设置 PWM"""
+        data = self._read_json()
+        pwm = int(data.get("pwm", 0))
+        success = ctl.set_manual_pwm(pwm)
+        self._json_response({"success": success, "pwm": pwm})
+    
+    async def _handle_control_toggle(self, ctl: FanController) -> None:
+        """POST /api/control/toggle - 启用/禁用自动控制"""
+        data = self._read_json()
+        enabled = data.get("enabled", True)
+        ctl.set_enabled(bool(enabled))
+        self._json_response({"success": True, "enabled": ctl.config.enabled})
+    
+    async def _handle_refresh(self, ctl: FanController) -> None:
+        """POST /api/refresh - 刷新状态"""
+        self._send_json_bytes(b'{"status":%s}' % ctl.get_status_json())
+    
+    # 路由表：(方法, 路径) -> 处理函数
+    ROUTES: Dict[tuple, Callable] = {
+        ("GET", "/api/status"): _handle_status,
+        ("GET", "/api/config"): _handle_config_get,
+        ("PUT", "/api/config"): _handle_config_put,
+        ("GET", "/api/disks"): _handle_disks,
+        ("POST", "/api/disks/refresh"): _handle_disks_refresh,
+        ("PUT", "/api/disks/active"): _handle_disks_active,
+        ("POST", "/api/control/pwm"): _handle_control_pwm,
+        ("POST", "/api/control/toggle"): _handle_control_toggle,
+        ("POST", "/api/refresh"): _handle_refresh,
+    }
+
+
+async def serve(fan_controller: FanController, host: str, port: int, unix_socket: Optional[str]) -> None:
+    """在同一个事件循环中运行控制循环和 HTTP 服务，直到收到退出信号"""
+    fan_controller.start()
+    
+    abstract = _is_abstract_socket(unix_socket)
     if unix_socket:
-        # Unix socket 模式
-        if os.path.exists(unix_socket):
+        # Unix socket 模式（抽象命名空间 socket 没有文件，无需清理）
+        if not abstract and os.path.exists(unix_socket):
             os.unlink(unix_socket)
-        
-        # 初始化服务器但不绑定默认 socket
-        server = ThreadingHTTPServer(("", 0), APIHandler, bind_and_activate=False)
-        
-        # 创建 Unix socket
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        sock.bind(unix_socket)
-        
-        # 替换服务器 socket 并设置正确的地址族
-        server.socket = sock
-        server.address_family = socket.AF_UNIX
-        server.server_address = unix_socket
-        
-        # 激活服务器（调用 listen）
-        server.server_activate()
-        
-        logger.info(f"风扇调控服务启动于 unix://{unix_socket}")
+        server = await asyncio.start_unix_server(APIHandler.serve_connection, path=unix_socket)
+        logger.info(f"风扇调控服务启动于 unix://{'@' + unix_socket[1:] if abstract else unix_socket}")
     else:
-        server = ThreadingHTTPServer((host, port), APIHandler)
+        # asyncio 会为接受的 TCP 连接设置 TCP_NODELAY，小响应不会被 Nagle 算法延迟
+        server = await asyncio.start_server(APIHandler.serve_connection, host, port, reuse_address=True)
         logger.info(f"风扇调控服务启动于 http://{host}:{port}")
     
-    shutdown_event = threading.Event()
+    shutdown_event = asyncio.Event()
     
-    def handle_signal(signum, frame):
+    def handle_signal():
         if shutdown_event.is_set():
             return
         shutdown_event.set()
         logger.info("正在关闭...")
-        threading.Thread(target=server.shutdown, daemon=True).start()
     
-    signal.signal(signal.SIGINT, handle_signal)
-    signal.signal(signal.SIGTERM, handle_signal)
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGINT, handle_signal)
+    loop.add_signal_handler(signal.SIGTERM, handle_signal)
     
     try:
-        server.serve_forever()
+        await shutdown_event.wait()
     finally:
-        controller.stop()
-        server.server_close()
-        if unix_socket and os.path.exists(unix_socket):
+        server.close()
+        await fan_controller.stop()
+        await server.wait_closed()
+        if unix_socket and not abstract and os.path.exists(unix_socket):
             os.unlink(unix_socket)
 
 
+def run_server(host: str = None, port: int = 28257, unix_socket: str = None, config_path: str = None):
+    """运行 HTTP 服务（未指定 host 和 unix_socket 时，Linux 下监听抽象命名空间 socket，其他平台监听 0.0.0.0）"""
+    global controller
+    
+    if not unix_socket and not host:
+        if sys.platform.startswith("linux"):
+            unix_socket = DEFAULT_ABSTRACT_SOCKET
+        else:
+            host = "0.0.0.0"
+    
+    # 如果没有指定配置文件路径，根据 unix_socket 路径自动推断
+    if not config_path and unix_socket and not _is_abstract_socket(unix_socket):
+        config_path = os.path.join(os.path.dirname(unix_socket), "config.json")
+    
+    controller = FanController(config_path=config_path)
+    asyncio.run(serve(controller, host, port, unix_socket))
+
+
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="风扇自动调控服务")
-    parser.add_argument("--host", default="0.0.0.0", help="监听地址")
+    parser.add_argument("--host", help="监听地址（未指定且未使用 --unix-socket 时，Linux 下监听抽象 Unix socket @fn-fan.sock）")
     parser.add_argument("--port", type=int, default=28257, help="监听端口")
     parser.add_argument("--unix-socket", help="Unix socket 路径")
     parser.add_argument("--config", help="配置文件路径（默认与 socket 同目录的 config.json）")
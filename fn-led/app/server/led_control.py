@@ -6,22 +6,27 @@ LED控制服务
 支持 HTTP API 配置
 """
 
+import io
 import json
 import logging
 import os
 import re
+import selectors
+import shutil
 import signal
 import socket
+import struct
 import subprocess
 import sys
 import threading
 import time
-from dataclasses import dataclass, field, asdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
+from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlparse
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Sequence, Tuple, Union
 
 # ============================================================================
 # 日志配置
@@ -34,6 +39,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger("led_control")
 
+# JSON 编解码：安装了 orjson 时优先使用，否则回退到标准库（输出均为 UTF-8 字节）
+try:
+    import orjson
+    
+    def _dumps(obj: Any, indent: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    
+    _loads = orjson.loads
+except ImportError:
+    # API 响应使用预先构造的紧凑编码器，省去每次调用时的参数处理和多余空格
+    _json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    
+    def _dumps(obj: Any, indent: bool = False) -> bytes:
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        return _json_encoder.encode(obj).encode("utf-8")
+    
+    _loads = json.loads
+
 
 # ============================================================================
 # 默认配置常量
@@ -67,6 +94,11 @@ BREATH_SPEEDS = {
     "slow": (3000, 1000),
 }
 
+# 预先格式化的 ugreen_leds_cli 参数
+_COLOR_ARGS = {name: ("-color", str(r), str(g), str(b)) for name, (r, g, b) in COLORS.items()}
+_BLINK_ARGS = {name: ("-blink", str(on_ms), str(off_ms)) for name, (on_ms, off_ms) in BLINK_SPEEDS.items()}
+_BREATH_ARGS = {name: ("-breath", str(cycle_ms), str(on_ms)) for name, (cycle_ms, on_ms) in BREATH_SPEEDS.items()}
+
 # 默认硬盘PCI路径映射
 DEFAULT_DISK_PCI_PATHS = {
     "SSD1": "pci-0000:05:00.0-nvme-1",
@@ -111,6 +143,9 @@ class LedConfig:
     led_brightness: int = 32
     led_brightness_startup: int = 64
     
+    # HTTP API 工作线程数
+    api_workers: int = 8
+    
     # 硬盘PCI路径映射
     disk_pci_paths: Dict[str, str] = field(default_factory=lambda: DEFAULT_DISK_PCI_PATHS.copy())
     
@@ -118,23 +153,77 @@ class LedConfig:
     disk_led_map: Dict[str, str] = field(default_factory=lambda: DEFAULT_DISK_LED_MAP.copy())
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # 所有字段都是简单类型或一层容器，浅拷贝即可，无需 asdict 的递归深拷贝
+        return {
+            **self.__dict__,
+            "push_scheduled_hours": list(self.push_scheduled_hours),
+            "disk_pci_paths": dict(self.disk_pci_paths),
+            "disk_led_map": dict(self.disk_led_map),
+        }
     
     def update(self, data: Dict[str, Any]) -> None:
+        """更新配置：只接受已定义的字段，值的类型必须与默认值一致（数字字符串会转换为整数）"""
         for key, value in data.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
+            if key not in self.__dataclass_fields__:
+                continue
+            coerced = self._coerce(getattr(self, key), value)
+            if coerced is None:
+                logger.warning("忽略无效的配置项 %s: %r", key, value)
+                continue
+            setattr(self, key, coerced)
+    
+    @staticmethod
+    def _coerce(current: Any, value: Any) -> Any:
+        """按当前值的类型校验并转换新值，无效时返回 None"""
+        if isinstance(current, bool):
+            return value if isinstance(value, bool) else None
+        if isinstance(current, int):
+            if isinstance(value, bool):
+                return None
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+        if isinstance(current, str):
+            return value if isinstance(value, str) else None
+        if isinstance(current, list):
+            if not isinstance(value, list) or any(isinstance(item, bool) for item in value):
+                return None
+            try:
+                return [int(item) for item in value]
+            except (TypeError, ValueError):
+                return None
+        if isinstance(current, dict):
+            if not isinstance(value, dict) or not all(isinstance(v, str) for v in value.values()):
+                return None
+            return dict(value)
+        return None
     
     def save(self, path: str) -> bool:
         """保存配置到文件"""
+        return self.save_dict(path, self.to_dict())
+    
+    @staticmethod
+    def save_dict(path: str, data: Dict[str, Any]) -> bool:
+        """将配置快照（to_dict() 的结果）保存到文件"""
         try:
             os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
-            logger.info(f"配置已保存到 {path}")
+            # 先写临时文件再替换，写入中途出错也不会损坏原配置
+            tmp_path = path + ".tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(_dumps(data, indent=True))
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            logger.info("配置已保存到 %s", path)
             return True
         except Exception as e:
-            logger.warning(f"保存配置失败: {e}")
+            logger.warning("保存配置失败: %s", e)
             return False
     
     @classmethod
@@ -143,12 +232,12 @@ class LedConfig:
         config = cls()
         try:
             if os.path.exists(path):
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(path, 'rb') as f:
+                    data = _loads(f.read())
                 config.update(data)
-                logger.info(f"已加载配置: {path}")
+                logger.info("已加载配置: %s", path)
         except Exception as e:
-            logger.warning(f"加载配置失败，使用默认值: {e}")
+            logger.warning("加载配置失败，使用默认值: %s", e)
         return config
 
 
@@ -188,43 +277,47 @@ class LedController:
             result = subprocess.run(cmd, capture_output=True, timeout=5)
             return result.returncode == 0
         except Exception as e:
-            logger.debug(f"执行LED命令失败: {e}")
+            logger.debug("执行LED命令失败: %s", e)
             return False
     
-    def set_led(self, name: str, color: str, brightness: int = None) -> bool:
+    @staticmethod
+    def _targets(name: Union[str, Sequence[str]]) -> List[str]:
+        """LED名称参数：ugreen_leds_cli 支持一次指定多个LED，各方法的 name 可传入单个名称或名称列表"""
+        return [name] if isinstance(name, str) else list(name)
+    
+    def set_led(self, name: Union[str, Sequence[str]], color: str, brightness: int = None) -> bool:
         """设置LED颜色"""
         if brightness is None:
             brightness = self.config.led_brightness
-        rgb = COLORS.get(color, COLORS["white"])
-        args = [name, "-color", str(rgb[0]), str(rgb[1]), str(rgb[2]),
+        args = [*self._targets(name), *_COLOR_ARGS.get(color, _COLOR_ARGS["white"]),
                 "-brightness", str(brightness), "-on"]
         return self._run_cmd(args)
     
-    def set_blink(self, name: str, color: str, brightness: int = None, 
+    def set_blink(self, name: Union[str, Sequence[str]], color: str, brightness: int = None, 
                   speed: str = "normal") -> bool:
         """设置LED闪烁"""
         if brightness is None:
             brightness = self.config.led_brightness
-        rgb = COLORS.get(color, COLORS["white"])
-        on_ms, off_ms = BLINK_SPEEDS.get(speed, BLINK_SPEEDS["normal"])
-        args = [name, "-color", str(rgb[0]), str(rgb[1]), str(rgb[2]),
-                "-brightness", str(brightness), "-blink", str(on_ms), str(off_ms)]
-        return self._run_cmd(args)
+        return self._run_cmd(self._targets(name) + self._blink_args(color, brightness, speed))
     
-    def set_breath(self, name: str, color: str, brightness: int = None,
+    @staticmethod
+    def _blink_args(color: str, brightness: int, speed: str) -> List[str]:
+        """闪烁命令参数（不含LED名称）"""
+        return [*_COLOR_ARGS.get(color, _COLOR_ARGS["white"]),
+                "-brightness", str(brightness), *_BLINK_ARGS.get(speed, _BLINK_ARGS["normal"])]
+    
+    def set_breath(self, name: Union[str, Sequence[str]], color: str, brightness: int = None,
                    speed: str = "normal") -> bool:
         """设置LED呼吸灯"""
         if brightness is None:
             brightness = self.config.led_brightness
-        rgb = COLORS.get(color, COLORS["white"])
-        cycle_ms, on_ms = BREATH_SPEEDS.get(speed, BREATH_SPEEDS["normal"])
-        args = [name, "-color", str(rgb[0]), str(rgb[1]), str(rgb[2]),
-                "-brightness", str(brightness), "-breath", str(cycle_ms), str(on_ms)]
+        args = [*self._targets(name), *_COLOR_ARGS.get(color, _COLOR_ARGS["white"]),
+                "-brightness", str(brightness), *_BREATH_ARGS.get(speed, _BREATH_ARGS["normal"])]
         return self._run_cmd(args)
     
-    def turn_off(self, name: str) -> bool:
+    def turn_off(self, name: Union[str, Sequence[str]]) -> bool:
         """关闭LED"""
-        return self._run_cmd([name, "-off"])
+        return self._run_cmd([*self._targets(name), "-off"])
     
     def turn_off_all(self) -> bool:
         """关闭所有LED"""
@@ -235,11 +328,8 @@ class LedController:
         if brightness is None:
             brightness = self.config.led_brightness_startup
         leds = ["power", "netdev", "disk1", "disk2", "disk3", "disk4"]
-        success = True
-        for led in leds:
-            if not self.set_blink(led, color, brightness, speed):
-                success = False
-        return success
+        # ugreen_leds_cli 支持一次指定多个LED
+        return self._run_cmd(leds + self._blink_args(color, brightness, speed))
 
 
 # ============================================================================
@@ -255,6 +345,13 @@ class DiskInfo:
     busy_percent: int = 0
 
 
+# 硬盘休眠状态缓存时间（秒），休眠状态变化较慢，无需每次都调用 hdparm
+SLEEP_STATUS_TTL = 15.0
+
+# iostat -x 输出中的硬盘行：设备名 ... %util（最后一列）
+IOSTAT_RE = re.compile(rb"^((?:sd|nvme)\S*)\s.*\s(\d+(?:\.\d+)?)\s*$")
+
+
 class DiskMonitor:
     """硬盘监控器"""
     
@@ -263,29 +360,88 @@ class DiskMonitor:
         self.disks: Dict[str, DiskInfo] = {}
         self._iostat_thread: Optional[threading.Thread] = None
         self._iostat_running = False
+        # 硬盘繁忙度 {device: %util}，由 iostat 线程写入。单个键的读写在 CPython 中是原子的，
+        # 且值为不可变的 int，因此无需加锁；如需遍历请先用 dict() 复制
         self._busy_data: Dict[str, int] = {}
-        self._busy_lock = threading.Lock()
+        # 休眠状态缓存 {device: (检测时间, 是否休眠)}，由主循环及其临时线程池按设备写入
+        self._sleep_cache: Dict[str, Tuple[float, bool]] = {}
+        # /dev/disk/by-path 目录内容缓存 {链接名: 设备名}，目录变化（热插拔）时重建
+        self._bypath_key: Optional[Tuple[int, int]] = None
+        self._bypath_entries: Dict[str, str] = {}
+        # find_disks 结果缓存，目录和 PCI 路径配置都未变化时直接复用
+        self._disk_map_key: Optional[tuple] = None
+        self._disk_map: Dict[str, str] = {}
+        # PCI 路径预筛选用的正则（所有路径的多选一）及 路径 -> disk_id 列表，PCI 路径配置变化时重建
+        self._pci_patterns: Optional[tuple] = None
+        self._pci_re: Optional[re.Pattern] = None
+        self._pci_ids: Dict[str, List[str]] = {}
+    
+    def _scan_by_path(self, by_path: str) -> Dict[str, str]:
+        """读取 /dev/disk/by-path（跳过分区），返回 {链接名: 设备名}，目录未变化时直接返回缓存"""
+        st = os.stat(by_path)
+        key = (st.st_mtime_ns, st.st_ino)
+        if key == self._bypath_key:
+            return self._bypath_entries
+        
+        entries = {}
+        with os.scandir(by_path) as it:
+            for entry in it:
+                # DirEntry 的类型来自目录读取结果，无需额外 stat
+                if "part" in entry.name or not entry.is_symlink():
+                    continue
+                try:
+                    entries[entry.name] = os.path.basename(os.readlink(entry.path))
+                except OSError as e:
+                    logger.debug("读取 %s 失败: %s", entry.path, e)
+        self._bypath_key = key
+        self._bypath_entries = entries
+        return entries
+    
+    def _compile_pci_patterns(self, patterns: tuple) -> None:
+        """把 (disk_id, PCI 路径) 编译为一个正则，用于快速排除不相关的链接"""
+        own: Dict[str, List[str]] = {}
+        for disk_id, pci_pattern in patterns:
+            if pci_pattern:
+                own.setdefault(pci_pattern, []).append(disk_id)
+        self._pci_re = re.compile("|".join(map(re.escape, own))) if own else None
+        self._pci_ids = own
+        self._pci_patterns = patterns
     
     def find_disks(self) -> Dict[str, str]:
         """检测所有硬盘，返回 {disk_id: device_name}"""
         result = {}
-        by_path = Path("/dev/disk/by-path")
-        
-        if not by_path.exists():
+        try:
+            entries = self._scan_by_path("/dev/disk/by-path")
+        except OSError:
             return result
         
-        for disk_id, pci_pattern in self.config.disk_pci_paths.items():
-            try:
-                for entry in by_path.iterdir():
-                    if pci_pattern in entry.name and "part" not in entry.name:
-                        real_path = entry.resolve()
-                        device = real_path.name
-                        result[disk_id] = device
-                        break
-            except Exception as e:
-                logger.debug(f"检测硬盘 {disk_id} 失败: {e}")
+        patterns = tuple(self.config.disk_pci_paths.items())
+        key = (self._bypath_key, patterns)
+        if key == self._disk_map_key:
+            return dict(self._disk_map)
         
-        return result
+        if patterns != self._pci_patterns:
+            self._compile_pci_patterns(patterns)
+        
+        # 正则只做预筛选；命中的链接名再逐个检查路径，
+        # 以免互相重叠的路径只被记入其中一个。同一硬盘取第一个匹配的链接
+        found = {}
+        if self._pci_re is not None:
+            search = self._pci_re.search
+            pci_ids = self._pci_ids.items()
+            for name, device in entries.items():
+                if search(name):
+                    for pci_pattern, disk_ids in pci_ids:
+                        if pci_pattern in name:
+                            for disk_id in disk_ids:
+                                found.setdefault(disk_id, device)
+        
+        # 保持配置中的硬盘顺序
+        result = {disk_id: found[disk_id] for disk_id, _ in patterns if disk_id in found}
+        
+        self._disk_map_key = key
+        self._disk_map = result
+        return dict(result)
     
     def update_disk_map(self):
         """更新硬盘映射"""
@@ -295,23 +451,35 @@ class DiskMonitor:
                 self.disks[disk_id] = DiskInfo(disk_id=disk_id)
             self.disks[disk_id].device = device
     
-    def check_sleep_status(self, device: str) -> bool:
-        """检查硬盘是否休眠"""
+    def _cached_sleep_status(self, device: str) -> Optional[bool]:
+        """返回缓存中仍有效的休眠状态，需要重新检测时返回 None"""
         if not device or device.startswith("nvme"):
             return False
+        cached = self._sleep_cache.get(device)
+        if cached and time.monotonic() - cached[0] < SLEEP_STATUS_TTL:
+            return cached[1]
+        return None
+    
+    def check_sleep_status(self, device: str) -> bool:
+        """检查硬盘是否休眠"""
+        cached = self._cached_sleep_status(device)
+        if cached is not None:
+            return cached
+        now = time.monotonic()
         try:
             result = subprocess.run(
                 ["hdparm", "-C", f"/dev/{device}"],
                 capture_output=True, text=True, timeout=5
             )
-            return "standby" in result.stdout.lower()
+            sleeping = "standby" in result.stdout.lower()
         except Exception:
-            return False
+            sleeping = False
+        self._sleep_cache[device] = (now, sleeping)
+        return sleeping
     
     def get_busy_percent(self, device: str) -> int:
         """获取硬盘繁忙度"""
-        with self._busy_lock:
-            return self._busy_data.get(device, 0)
+        return self._busy_data.get(device, 0)
     
     def start_iostat_monitor(self):
         """启动 iostat 监控线程"""
@@ -333,33 +501,42 @@ class DiskMonitor:
         try:
             process = subprocess.Popen(
                 ["iostat", "-x", "1"],
-                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
             )
-            while self._iostat_running and process.poll() is None:
-                line = process.stdout.readline()
-                if line.startswith(("sd", "nvme")):
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        device = parts[0]
-                        try:
-                            util = int(float(parts[-1].replace("%", "")))
-                            with self._busy_lock:
-                                self._busy_data[device] = util
-                        except ValueError:
-                            pass
+            match = IOSTAT_RE.match
+            busy = self._busy_data
+            # 以字节方式读取，只解码匹配到的设备名
+            for line in iter(process.stdout.readline, b""):
+                if not self._iostat_running:
+                    break
+                m = match(line)
+                if m:
+                    busy[m.group(1).decode("ascii", "replace")] = int(float(m.group(2)))
             process.terminate()
         except Exception as e:
-            logger.error(f"iostat 监控异常: {e}")
+            logger.error("iostat 监控异常: %s", e)
     
     def update_all_status(self):
         """更新所有硬盘状态"""
         self.update_disk_map()
-        for disk_id, info in self.disks.items():
-            if not info.device:
-                continue
+        disks = [info for info in self.disks.values() if info.device]
+        busy = {}
+        for info in disks:
+            busy[info.device] = self.get_busy_percent(info.device)
+            if busy[info.device] > 0:
+                # 有 IO 说明硬盘已唤醒，不必等待休眠状态缓存过期
+                self._sleep_cache[info.device] = (time.monotonic(), False)
+        
+        # 缓存过期的硬盘并发执行 hdparm，结果写入缓存
+        stale = [info.device for info in disks if self._cached_sleep_status(info.device) is None]
+        if len(stale) > 1:
+            with ThreadPoolExecutor(max_workers=len(stale)) as executor:
+                list(executor.map(self.check_sleep_status, stale))
+        
+        for info in disks:
             info.is_sleeping = self.check_sleep_status(info.device)
             if not info.is_sleeping:
-                info.busy_percent = self.get_busy_percent(info.device)
+                info.busy_percent = busy[info.device]
     
     def get_status(self) -> Dict[str, Any]:
         """获取硬盘状态"""
@@ -384,6 +561,32 @@ class NetworkStatus:
     external_ok: bool = False
 
 
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMP_PAYLOAD = b"fn-led"
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """ICMP 校验和（RFC 1071）"""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _detect_icmp_socket_type() -> Optional[int]:
+    """检测可用的 ICMP socket 类型：优先免特权的 SOCK_DGRAM，其次 SOCK_RAW（需要 root）"""
+    for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+        try:
+            socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP).close()
+            return sock_type
+        except OSError:
+            continue
+    return None
+
+
 class NetworkMonitor:
     """网络监控器（后台异步检测）"""
     
@@ -393,9 +596,63 @@ class NetworkMonitor:
         self._lock = threading.Lock()
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        self._icmp_sock_type = _detect_icmp_socket_type()
+        self._icmp_seq = 0
+        if self._icmp_sock_type is None:
+            logger.info("无法创建 ICMP socket，使用 ping 命令检测网络")
     
     def _ping(self, ip: str, count: int = 1, timeout: int = 1) -> bool:
-        """Ping 检测"""
+        """Ping 检测（优先直接发送 ICMP 报文，无法使用 ICMP socket 时调用 ping 命令）"""
+        if self._icmp_sock_type is not None:
+            try:
+                return self._icmp_ping(ip, timeout)
+            except PermissionError:
+                self._icmp_sock_type = None
+                logger.info("无法使用 ICMP socket，改用 ping 命令检测网络")
+            except OSError:
+                # 网络不可达等
+                return False
+        return self._ping_cmd(ip, count, timeout)
+    
+    def _icmp_ping(self, ip: str, timeout: float = 1.0) -> bool:
+        """发送一个 ICMP Echo 请求并等待应答"""
+        sock_type = self._icmp_sock_type
+        addr = socket.gethostbyname(ip)
+        ident = os.getpid() & 0xFFFF
+        self._icmp_seq = seq = (self._icmp_seq + 1) & 0xFFFF
+        header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+        checksum = _icmp_checksum(header + ICMP_PAYLOAD)
+        packet = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + ICMP_PAYLOAD
+        
+        with socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP) as sock:
+            sock.sendto(packet, (addr, 0))
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                sock.settimeout(remaining)
+                try:
+                    data, peer = sock.recvfrom(1024)
+                except socket.timeout:
+                    return False
+                if peer[0] != addr:
+                    continue
+                if sock_type == socket.SOCK_RAW:
+                    # 原始 socket 收到的数据包含 IP 头，且 ID 由本进程决定
+                    data = data[(data[0] & 0x0F) * 4:]
+                if len(data) < 8:
+                    continue
+                icmp_type, _, _, reply_id, reply_seq = struct.unpack("!BBHHH", data[:8])
+                if icmp_type != ICMP_ECHO_REPLY or reply_seq != seq:
+                    continue
+                # SOCK_DGRAM 下内核会改写 ID 并只投递本 socket 的应答
+                if sock_type == socket.SOCK_RAW and reply_id != ident:
+                    continue
+                return True
+    
+    def _ping_cmd(self, ip: str, count: int = 1, timeout: int = 1) -> bool:
+        """通过 ping 命令检测"""
         try:
             result = subprocess.run(
                 ["ping", "-c", str(count), "-W", str(timeout), ip],
@@ -440,11 +697,20 @@ class NetworkMonitor:
 # 消息推送
 # ============================================================================
 
+# 未找到 push 命令时，重新查找的间隔（秒）
+PUSH_BIN_RECHECK_INTERVAL = 60
+
+# 需要推送状态的硬盘（只检查 Disk1-4，不检查 USB 硬盘和 SSD）
+PUSH_DISK_IDS = ("Disk1", "Disk2", "Disk3", "Disk4")
+
+
 class PushNotifier:
     """消息推送器"""
     
     def __init__(self, config: LedConfig):
         self.config = config
+        self._push_bin: Optional[str] = shutil.which("push")
+        self._push_bin_checked: float = time.monotonic()
         self._last_sleep_states: Dict[str, bool] = {}
         self._last_health_states: Dict[str, bool] = {}
         self._last_push_hour: int = -1
@@ -454,39 +720,49 @@ class PushNotifier:
     def _send_push(self, message: str, tag: str = "消息推送") -> bool:
         """发送推送消息（后台执行，不阻塞）"""
         try:
-            # 检查 push 命令是否存在
-            result = subprocess.run(["which", "push"], capture_output=True)
-            if result.returncode != 0:
-                return False
+            # 检查 push 命令是否存在（未找到时定期重新查找，以便之后安装）
+            if not self._push_bin:
+                now = time.monotonic()
+                if now - self._push_bin_checked < PUSH_BIN_RECHECK_INTERVAL:
+                    return False
+                self._push_bin = shutil.which("push")
+                self._push_bin_checked = now
+                if not self._push_bin:
+                    return False
             
             # 后台执行，不等待结果
             subprocess.Popen(
-                ["push", message],
+                [self._push_bin, message],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
                 start_new_session=True  # 避免僵尸进程
             )
-            logger.info(f"{tag}: 推送已发送 - {message}")
+            logger.info("%s: 推送已发送 - %s", tag, message)
             return True
         except Exception as e:
-            logger.error(f"{tag}: 推送异常 - {e}")
+            logger.error("%s: 推送异常 - %s", tag, e)
             return False
     
-    def check_sleep_change(self, disks: Dict[str, DiskInfo]) -> None:
+    @staticmethod
+    def snapshot(disks: Dict[str, DiskInfo]) -> Dict[str, Optional[bool]]:
+        """每轮生成一次推送硬盘的状态快照 {disk_id: 是否休眠}，离线为 None"""
+        result = {}
+        for disk_id in PUSH_DISK_IDS:
+            disk = disks.get(disk_id)
+            result[disk_id] = disk.is_sleeping if disk and disk.device else None
+        return result
+    
+    def check_sleep_change(self, snapshot: Dict[str, Optional[bool]]) -> None:
         """检查硬盘休眠状态变化并推送（只检查Disk1-4）"""
         current_states = {}
         changed = []
         
-        # 只检查 Disk1-4，不检查 USB 硬盘和 SSD
-        push_disk_ids = ["Disk1", "Disk2", "Disk3", "Disk4"]
-        
-        for disk_id in push_disk_ids:
-            disk = disks.get(disk_id)
-            if disk and disk.device:
-                current_states[disk_id] = disk.is_sleeping
+        for disk_id, sleeping in snapshot.items():
+            if sleeping is not None:
+                current_states[disk_id] = sleeping
                 last_state = self._last_sleep_states.get(disk_id)
-                if last_state is not None and last_state != disk.is_sleeping:
-                    status = "休眠" if disk.is_sleeping else "唤醒"
+                if last_state is not None and last_state != sleeping:
+                    status = "休眠" if sleeping else "唤醒"
                     changed.append(f"{disk_id}({status})")
         
         if changed:
@@ -499,10 +775,9 @@ class PushNotifier:
                 return
             
             status_icons = []
-            for disk_id in push_disk_ids:
-                disk = disks.get(disk_id)
-                if disk and disk.device:
-                    status_icons.append("🔵" if disk.is_sleeping else "🔴")
+            for sleeping in snapshot.values():
+                if sleeping is not None:
+                    status_icons.append("🔵" if sleeping else "🔴")
                 else:
                     status_icons.append("⚪")
             
@@ -514,19 +789,16 @@ class PushNotifier:
         
         self._last_sleep_states = current_states
     
-    def check_offline_change(self, disks: Dict[str, DiskInfo]) -> None:
+    def check_offline_change(self, snapshot: Dict[str, Optional[bool]]) -> None:
         """检查硬盘离线状态并推送（只检查Disk1-4）"""
         current_hour = time.localtime().tm_hour
         offline_disks = []
         new_offline = []
         
-        # 只检查 Disk1-4，不检查 USB 硬盘和 SSD
-        push_disk_ids = ["Disk1", "Disk2", "Disk3", "Disk4"]
-        for disk_id in push_disk_ids:
-            disk = disks.get(disk_id)
+        for disk_id, sleeping in snapshot.items():
             was_online = self._last_health_states.get(disk_id, True)
             
-            if disk is None or not disk.device:
+            if sleeping is None:
                 offline_disks.append(disk_id)
                 if was_online:
                     new_offline.append(disk_id)
@@ -563,40 +835,45 @@ class LedState(Enum):
     WHITE_BLINK = "white_blink"
 
 
+# LedState -> 字符串值（Enum 的 .value 是描述符属性，每轮更新都要访问，预先取出）
+_LED_STATE_VALUES: Dict[LedState, str] = {state: state.value for state in LedState}
+
+
 class LedStateManager:
     """LED状态管理器"""
     
+    # LED状态 -> (LedController 方法, 颜色, 速度, 亮度配置项)
+    _STATE_TABLE: ClassVar[Dict[LedState, Tuple[str, Optional[str], Optional[str], Optional[str]]]] = {
+        LedState.OFF: ("turn_off", None, None, None),
+        LedState.RED_ON: ("set_led", "red", None, "led_brightness"),
+        LedState.RED_BLINK: ("set_blink", "red", "normal", "led_brightness"),
+        LedState.BLUE_ON: ("set_led", "blue", None, "led_brightness"),
+        LedState.BLUE_BREATH: ("set_breath", "blue", "fast", "led_brightness"),
+        LedState.YELLOW_ON: ("set_led", "yellow", None, "led_brightness"),
+        LedState.YELLOW_BLINK_SLOW: ("set_blink", "yellow", "slow", "led_brightness"),
+        LedState.YELLOW_BLINK_NORMAL: ("set_blink", "yellow", "normal", "led_brightness"),
+        LedState.YELLOW_BLINK_FAST: ("set_blink", "yellow", "fast", "led_brightness"),
+        LedState.YELLOW_BLINK_VERYFAST: ("set_blink", "yellow", "veryfast", "led_brightness"),
+        LedState.WHITE_BLINK: ("set_blink", "white", "fast", "led_brightness_startup"),
+    }
+    
     def __init__(self, controller: LedController, config: LedConfig):
         self.controller = controller
         self.config = config
         self._current_states: Dict[str, LedState] = {}
     
-    def _apply_state(self, led_name: str, state: LedState) -> bool:
+    def _apply_state(self, led_name: Union[str, Sequence[str]], state: LedState) -> bool:
         """应用LED状态"""
-        b = self.config.led_brightness
-        if state == LedState.OFF:
+        spec = self._STATE_TABLE.get(state)
+        if spec is None:
+            return False
+        method, color, speed, brightness_key = spec
+        if method == "turn_off":
             return self.controller.turn_off(led_name)
-        elif state == LedState.RED_ON:
-            return self.controller.set_led(led_name, "red", b)
-        elif state == LedState.RED_BLINK:
-            return self.controller.set_blink(led_name, "red", b, "normal")
-        elif state == LedState.BLUE_ON:
-            return self.controller.set_led(led_name, "blue", b)
-        elif state == LedState.BLUE_BREATH:
-            return self.controller.set_breath(led_name, "blue", b, "fast")
-        elif state == LedState.YELLOW_ON:
-            return self.controller.set_led(led_name, "yellow", b)
-        elif state == LedState.YELLOW_BLINK_SLOW:
-            return self.controller.set_blink(led_name, "yellow", b, "slow")
-        elif state == LedState.YELLOW_BLINK_NORMAL:
-            return self.controller.set_blink(led_name, "yellow", b, "normal")
-        elif state == LedState.YELLOW_BLINK_FAST:
-            return self.controller.set_blink(led_name, "yellow", b, "fast")
-        elif state == LedState.YELLOW_BLINK_VERYFAST:
-            return self.controller.set_blink(led_name, "yellow", b, "veryfast")
-        elif state == LedState.WHITE_BLINK:
-            return self.controller.set_blink(led_name, "white", self.config.led_brightness_startup, "fast")
-        return False
+        brightness = getattr(self.config, brightness_key)
+        if speed is None:
+            return self.controller.set_led(led_name, color, brightness)
+        return getattr(self.controller, method)(led_name, color, brightness, speed)
     
     def set_state(self, led_name: str, state: LedState) -> bool:
         """设置LED状态"""
@@ -605,13 +882,26 @@ class LedStateManager:
             return True
         if self._apply_state(led_name, state):
             self._current_states[led_name] = state
-            logger.info(f"LED {led_name}: {current} -> {state.value}")
+            logger.info("LED %s: %s -> %s", led_name, current, state.value)
             return True
         return False
     
+    def set_states(self, states: Dict[str, LedState]) -> None:
+        """批量设置LED状态：目标状态相同的LED合并为一次命令"""
+        groups: Dict[LedState, List[str]] = {}
+        for led_name, state in states.items():
+            if self._current_states.get(led_name) != state:
+                groups.setdefault(state, []).append(led_name)
+        for state, led_names in groups.items():
+            if not self._apply_state(led_names, state):
+                continue
+            for led_name in led_names:
+                logger.info("LED %s: %s -> %s", led_name, self._current_states.get(led_name), state.value)
+                self._current_states[led_name] = state
+    
     def get_current_states(self) -> Dict[str, str]:
         """获取当前LED状态"""
-        return {name: state.value for name, state in self._current_states.items()}
+        return {name: _LED_STATE_VALUES[state] for name, state in self._current_states.items()}
     
     def determine_power_state(self, network: NetworkStatus) -> LedState:
         """根据网络状态确定POWER灯状态"""
@@ -645,6 +935,15 @@ class LedStateManager:
 # 主服务
 # ============================================================================
 
+# 主循环更新间隔（秒）：状态变化后使用最短间隔，稳定后逐步加倍到最长间隔
+UPDATE_INTERVAL_MIN = 0.25
+UPDATE_INTERVAL_MAX = 5.0
+# 状态变化后保持最短间隔的循环次数
+UPDATE_FAST_CYCLES = 3
+# 配置修改后延迟保存的时间（秒），合并前端连续修改产生的多次写盘
+CONFIG_SAVE_DELAY = 2.0
+
+
 class MonitorService:
     """LED监控服务"""
     
@@ -659,73 +958,121 @@ class MonitorService:
         self.led_manager = LedStateManager(self.controller, self.config)
         self.push_notifier = PushNotifier(self.config)
         self.lock = threading.RLock()
+        # 用于唤醒主循环（停止服务或配置变化时立即响应）
+        self._wake = threading.Event()
+        self._interval = UPDATE_INTERVAL_MIN
+        self._fast_cycles = 0
+        # 已发布的状态快照（发布后不再修改，读取无需加锁）及其序列化结果缓存
+        self._status: Dict[str, Any] = {}
+        self._status_cache: Optional[Tuple[Dict[str, Any], bytes]] = None
+        # 启动提示结束前不控制物理LED
+        self._startup_done = threading.Event()
+        # 配置延迟保存
+        self._config_dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        # 串行化配置写盘（写文件时不持有 self.lock），获取顺序：_save_lock -> lock
+        self._save_lock = threading.Lock()
         
         self._last_network_status = NetworkStatus()
         self._simulated_states: Dict[str, str] = {}
         self._load_i2c_module()
+        self._publish_status()
     
     def _load_i2c_module(self):
         """加载 i2c-dev 内核模块"""
+        # 模块已加载（或已内建）时无需再 fork modprobe
+        if os.path.exists("/sys/module/i2c_dev") or os.path.exists("/dev/i2c-0"):
+            return
         try:
             subprocess.run(["modprobe", "i2c-dev"], capture_output=True, timeout=5)
         except Exception as e:
-            logger.warning(f"加载 i2c-dev 模块失败: {e}")
+            logger.warning("加载 i2c-dev 模块失败: %s", e)
     
     def _show_startup_indicator(self):
-        """显示启动提示"""
-        logger.info("启动提示: LED白色闪烁")
-        self.controller.blink_all("white")
-        time.sleep(5)
-        self.controller.turn_off_all()
-        time.sleep(2)
+        """显示启动提示（后台线程执行，不阻塞主循环）"""
+        def run():
+            logger.info("启动提示: LED白色闪烁")
+            self.controller.blink_all("white")
+            time.sleep(5)
+            self.controller.turn_off_all()
+            time.sleep(2)
+            self._startup_done.set()
+            self._wake.set()
+        
+        threading.Thread(target=run, daemon=True).start()
     
-    def _update_leds(self):
-        """更新所有LED状态"""
+    def _update_leds(self) -> bool:
+        """更新所有LED状态，返回LED状态是否发生变化"""
         # 更新网络和硬盘状态（用于前端显示）
         network = self.network_monitor.get_status()
         self._last_network_status = network
         self.disk_monitor.update_all_status()
         
-        # 计算LED状态（用于前端模拟）
-        power_state = self.led_manager.determine_power_state(network)
-        disk_states = {}
+        # 计算LED状态（同时用于控制物理LED和前端模拟）
+        led_states = {"power": self.led_manager.determine_power_state(network)}
         for disk_id, led_name in self.config.disk_led_map.items():
             disk = self.disk_monitor.disks.get(disk_id)
             if disk:
-                disk_states[led_name] = self.led_manager.determine_disk_state(disk)
+                led_states[led_name] = self.led_manager.determine_disk_state(disk)
             else:
-                disk_states[led_name] = LedState.RED_BLINK
+                led_states[led_name] = LedState.RED_BLINK
         
-        # 只有启用时才控制物理LED
-        if self.config.led_enabled:
-            self.led_manager.set_state("power", power_state)
-            for led_name, state in disk_states.items():
-                self.led_manager.set_state(led_name, state)
+        # 只有启用且启动提示结束后才控制物理LED
+        if self.config.led_enabled and self._startup_done.is_set():
+            self.led_manager.set_states(led_states)
         
         # 更新模拟状态（即使LED关闭也更新，用于前端显示）
+        simulated = {led_name: _LED_STATE_VALUES[state] for led_name, state in led_states.items()}
         with self.lock:
-            self._simulated_states = {"power": power_state.value}
-            for led_name, state in disk_states.items():
-                self._simulated_states[led_name] = state.value
+            changed = simulated != self._simulated_states
+            self._simulated_states = simulated
+            self._publish_status()
         
-        self.push_notifier.check_sleep_change(self.disk_monitor.disks)
-        self.push_notifier.check_offline_change(self.disk_monitor.disks)
+        # 两项推送检查共用同一份快照
+        snapshot = self.push_notifier.snapshot(self.disk_monitor.disks)
+        self.push_notifier.check_sleep_change(snapshot)
+        self.push_notifier.check_offline_change(snapshot)
+        return changed
+    
+    def _next_interval(self, changed: bool) -> float:
+        """计算下一次更新间隔：最近有变化时快速轮询，稳定后逐步放慢"""
+        if changed:
+            self._fast_cycles = UPDATE_FAST_CYCLES
+        if self._fast_cycles > 0:
+            self._fast_cycles -= 1
+            self._interval = UPDATE_INTERVAL_MIN
+        else:
+            self._interval = min(self._interval * 2, UPDATE_INTERVAL_MAX)
+        return self._interval
+    
+    def _publish_status(self) -> None:
+        """生成新的状态快照并整体替换（需持有 self.lock）"""
+        # 返回模拟状态（即使物理LED关闭也显示应有的状态）
+        self._status = {
+            "running": self.running,
+            "led_enabled": self.config.led_enabled,
+            "network": {
+                "internal_ok": self._last_network_status.internal_ok,
+                "external_ok": self._last_network_status.external_ok,
+            },
+            "disks": self.disk_monitor.get_status(),
+            "leds": self._simulated_states,
+        }
     
     def get_status(self) -> Dict[str, Any]:
-        """获取服务状态"""
-        with self.lock:
-            # 返回模拟状态（即使物理LED关闭也显示应有的状态）
-            leds = self._simulated_states if self._simulated_states else self.led_manager.get_current_states()
-            return {
-                "running": self.running,
-                "led_enabled": self.config.led_enabled,
-                "network": {
-                    "internal_ok": self._last_network_status.internal_ok,
-                    "external_ok": self._last_network_status.external_ok,
-                },
-                "disks": self.disk_monitor.get_status(),
-                "leds": leds,
-            }
+        """获取服务状态（只读快照，调用方不得修改）"""
+        # 快照只会被整体替换，读取单个属性在 CPython 中是原子的，无需加锁
+        return self._status
+    
+    def get_status_bytes(self) -> bytes:
+        """获取序列化后的状态响应，快照未更新时直接复用上次的结果"""
+        status = self._status
+        cache = self._status_cache
+        if cache and cache[0] is status:
+            return cache[1]
+        body = _dumps({"status": status})
+        self._status_cache = (status, body)
+        return body
     
     def toggle_leds(self, enabled: bool) -> bool:
         """开关LED控制"""
@@ -735,9 +1082,10 @@ class MonitorService:
                 # 关闭所有物理LED
                 self.controller.turn_off_all()
                 self.led_manager._current_states.clear()
-            if self.config_path:
-                self.config.save(self.config_path)
-            logger.info(f"LED控制已{'启用' if enabled else '禁用'}")
+            self._schedule_save()
+            self._publish_status()
+            self._wake.set()
+            logger.info("LED控制已%s", "启用" if enabled else "禁用")
             return True
     
     def get_config(self) -> Dict[str, Any]:
@@ -749,8 +1097,32 @@ class MonitorService:
         """更新配置"""
         with self.lock:
             self.config.update(data)
-            if self.config_path:
-                self.config.save(self.config_path)
+            self._schedule_save()
+            self._wake.set()
+    
+    def _schedule_save(self) -> None:
+        """标记配置已修改，并在最后一次修改 CONFIG_SAVE_DELAY 秒后保存（需持有 self.lock）"""
+        if not self.config_path:
+            return
+        self._config_dirty = True
+        if self._save_timer:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(CONFIG_SAVE_DELAY, self._flush_config)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+    
+    def _flush_config(self) -> None:
+        """将未保存的配置写入文件"""
+        with self._save_lock:
+            # 只在锁内取配置快照，写文件时不阻塞 API 和主循环
+            with self.lock:
+                if not self._config_dirty:
+                    return
+                data = self.config.to_dict()
+                # 快照成功后才清除修改标记，避免出错时丢失未保存的修改
+                self._config_dirty = False
+                self._save_timer = None
+            self.config.save_dict(self.config_path, data)
     
     def start(self):
         """启动服务"""
@@ -759,22 +1131,32 @@ class MonitorService:
         logger.info("=" * 50)
         
         self.running = True
+        with self.lock:
+            self._publish_status()
         self.network_monitor.start()
         self.disk_monitor.start_iostat_monitor()
         self._show_startup_indicator()
         
         logger.info("进入主循环")
         while self.running:
+            changed = True
             try:
-                self._update_leds()
+                changed = self._update_leds()
             except Exception as e:
-                logger.exception(f"更新LED状态异常: {e}")
-            time.sleep(1)
+                logger.exception("更新LED状态异常: %s", e)
+            self._wake.wait(self._next_interval(changed))
+            self._wake.clear()
     
     def stop(self):
         """停止服务"""
         logger.info("正在停止服务...")
         self.running = False
+        self._wake.set()
+        with self.lock:
+            self._publish_status()
+            if self._save_timer:
+                self._save_timer.cancel()
+        self._flush_config()
         self.network_monitor.stop()
         self.disk_monitor.stop_iostat_monitor()
         self.controller.turn_off_all()
@@ -788,35 +1170,83 @@ class MonitorService:
 service: Optional[MonitorService] = None
 
 
+# 长连接空闲超时（秒），同时作为读取请求的超时
+KEEPALIVE_TIMEOUT = 5
+
+
 class APIHandler(BaseHTTPRequestHandler):
     """API 请求处理"""
     
+    # 使用 HTTP/1.1 长连接，前端轮询可复用同一连接，省去每次 accept/关闭的开销
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_TIMEOUT
+    
+    # 预先生成的状态行（与 protocol_version 一致），避免每次请求重新格式化
+    _STATUS_LINES: ClassVar[Dict[int, bytes]] = {
+        status.value: b"HTTP/1.1 %d %s\r\n" % (status.value, status.phrase.encode("latin-1"))
+        for status in HTTPStatus
+    }
+    # 预先拼好的固定响应头和 OPTIONS 响应，每个响应只需一次写出
+    _JSON_HEADERS: ClassVar[bytes] = (
+        b"Content-Type: application/json; charset=utf-8\r\n"
+        b"Access-Control-Allow-Origin: *\r\n"
+    )
+    _OPTIONS_RESPONSE: ClassVar[bytes] = (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Access-Control-Allow-Origin: *\r\n"
+        b"Access-Control-Allow-Methods: GET, POST, PUT, OPTIONS\r\n"
+        b"Access-Control-Allow-Headers: Content-Type\r\n"
+        b"Content-Length: 0\r\n"
+    )
+    
     def log_message(self, format, *args):
-        logger.debug(f"API: {format % args}")
+        # 请求日志只在调试级别输出，未启用时连格式串拼接也跳过
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("API: " + format, *args)
     
     def _json_response(self, data: Any, status: int = 200) -> None:
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        self._send_json_bytes(_dumps(data), status)
+    
+    def _send_json_bytes(self, body: bytes, status: int = 200) -> None:
+        # 状态行、响应头和响应体拼接后一次写出，避免多次 send
+        if logger.isEnabledFor(logging.DEBUG):
+            self.log_request(status)
+        self.wfile.write(b"".join((
+            self._STATUS_LINES[status],
+            self._JSON_HEADERS,
+            b"Content-Length: %d\r\n" % len(body),
+            self._connection_header(),
+            body,
+        )))
+    
+    def _connection_header(self) -> bytes:
+        """Connection 响应头（含响应头结束的空行）"""
+        return b"Connection: close\r\n\r\n" if self.close_connection else b"Connection: keep-alive\r\n\r\n"
     
     def _read_json(self) -> Dict:
+        header = self.headers.get("Content-Length")
+        if not header:
+            return {}
         try:
-            length = int(self.headers.get("Content-Length", 0))
-            if length > 0:
-                body = self.rfile.read(length)
-                return json.loads(body.decode("utf-8"))
-        except Exception:
-            pass
-        return {}
+            length = int(header)
+        except ValueError:
+            # 无法确定请求体边界，响应后关闭连接
+            self.close_connection = True
+            return {}
+        if length <= 0:
+            return {}
+        body = self.rfile.read(length)
+        # json.loads / orjson.loads 均直接接受 bytes，无需先解码
+        try:
+            data = _loads(body)
+        except ValueError:
+            return {}
+        # 处理函数只接受 JSON 对象，其它类型在这里直接拦下，而不是在处理函数中抛出异常
+        return data if isinstance(data, dict) else {}
     
     def do_OPTIONS(self):
-        self.send_response(200)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, PUT, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
-        self.end_headers()
+        self.log_request(200)
+        self.wfile.write(self._OPTIONS_RESPONSE + self._connection_header())
     
     def do_GET(self):
         self._handle_request("GET")
@@ -833,34 +1263,267 @@ class APIHandler(BaseHTTPRequestHandler):
             self._json_response({"error": "service not initialized"}, 500)
             return
         
-        path = urlparse(self.path).path.rstrip("/")
+        # 只需去掉查询字符串，无需完整解析 URL
+        path = self.path.partition("?")[0].rstrip("/")
+        handler = self.ROUTES.get((method, path))
+        if handler is None:
+            # 未读取的请求体会破坏长连接上的下一个请求，直接关闭连接
+            self.close_connection = True
+            self._json_response({"error": "not found"}, 404)
+            return
         
         try:
-            if path == "/api/status" and method == "GET":
-                self._json_response({"status": service.get_status()})
-                return
-            
-            if path == "/api/config" and method == "GET":
-                self._json_response({"config": service.get_config()})
+            handler(self, service)
+        except Exception as e:
+            logger.exception("API 错误: %s", e)
+            self._json_response({"error": str(e)}, 500)
+    
+    def _handle_status(self, svc: MonitorService) -> None:
+        """GET /api/status - 获取状态"""
+        self._send_json_bytes(svc.get_status_bytes())
+    
+    def _handle_config_get(self, svc: MonitorService) -> None:
+        """GET /api/config - 获取配置"""
+        self._json_response({"config": svc.get_config()})
+    
+    def _handle_config_put(self, svc: MonitorService) -> None:
+        """PUT /api/config - 更新配置"""
+        data = self._read_json()
+        svc.update_config(data)
+        self._json_response({"success": True, "config": svc.get_config()})
+    
+    def _handle_toggle(self, svc: MonitorService) -> None:
+        """POST /api/toggle - 开关LED控制"""
+        data = self._read_json()
+        enabled = data.get("enabled", True)
+        svc.toggle_leds(bool(enabled))
+        self._json_response({"success": True, "led_enabled": svc.config.led_enabled})
+    
+    # 路由表：(方法, 路径) -> 处理函数
+    ROUTES: ClassVar[Dict[Tuple[str, str], Callable]] = {
+        ("GET", "/api/status"): _handle_status,
+        ("GET", "/api/config"): _handle_config_get,
+        ("PUT", "/api/config"): _handle_config_put,
+        ("POST", "/api/toggle"): _handle_toggle,
+    }
+
+
+class PooledAPIHandler(APIHandler):
+    """线程池模式的请求处理：每个请求处理完即关闭连接
+    
+    空闲的长连接会一直占用固定大小线程池中的工作线程，几个浏览器标签页就能占满线程池，
+    因此长连接只在 Unix socket 的单线程事件循环（SelectorHTTPServer）中启用。
+    """
+    
+    def parse_request(self) -> bool:
+        ok = super().parse_request()
+        self.close_connection = True
+        return ok
+
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """使用固定线程池处理请求的 HTTP 服务器，避免每个连接创建一个新线程"""
+    
+    def __init__(self, *args, workers: int = 8, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="api")
+    
+    def process_request(self, request, client_address):
+        self._pool.submit(self.process_request_thread, request, client_address)
+    
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+
+# Unix socket 模式下单个请求（请求头 + 请求体）允许的最大字节数
+MAX_REQUEST_SIZE = 64 * 1024
+
+# 请求头中的 Content-Length，用于确定请求体边界
+CONTENT_LENGTH_RE = re.compile(rb"^content-length:[ \t]*(\d+)[ \t]*\r?$", re.IGNORECASE | re.MULTILINE)
+
+
+class _BufferedRequest:
+    """把已完整接收的请求伪装成 socket 交给 APIHandler 处理，响应写入输出缓冲"""
+    
+    def __init__(self, data: bytes):
+        self._data = data
+        self.output = bytearray()
+    
+    def settimeout(self, timeout: Optional[float]) -> None:
+        pass
+    
+    def makefile(self, mode: str = "rb", bufsize: int = -1) -> io.BytesIO:
+        return io.BytesIO(self._data)
+    
+    def sendall(self, data: bytes) -> None:
+        self.output += data
+
+
+class _InlineAPIHandler(APIHandler):
+    """每次只处理一个请求，长连接由 SelectorHTTPServer 维护"""
+    
+    def handle(self):
+        self.handle_one_request()
+
+
+class _Connection:
+    """SelectorHTTPServer 中单个客户端连接的状态"""
+    
+    __slots__ = ("sock", "inbuf", "outbuf", "last_active", "closing", "writing")
+    
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.inbuf = bytearray()
+        self.outbuf = bytearray()
+        self.last_active = time.monotonic()
+        self.closing = False
+        self.writing = False
+
+
+class SelectorHTTPServer:
+    """单线程 HTTP 服务器（用于 Unix socket）
+    
+    本机请求都很短小，用 selectors 在一个线程内完成 accept、读取和写出，
+    不为连接创建线程。接口与 socketserver 的 serve_forever/shutdown/server_close 一致。
+    """
+    
+    def __init__(self, sock: socket.socket, server_address: str):
+        self.socket = sock
+        self.server_address = server_address
+        sock.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(sock, selectors.EVENT_READ, None)
+        self._conns: Dict[socket.socket, _Connection] = {}
+        self._shutdown_request = False
+        self._stopped = threading.Event()
+    
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        self._stopped.clear()
+        try:
+            while not self._shutdown_request:
+                for key, events in self._selector.select(poll_interval):
+                    conn = key.data
+                    if conn is None:
+                        self._accept()
+                        continue
+                    if events & selectors.EVENT_READ:
+                        self._on_readable(conn)
+                    if events & selectors.EVENT_WRITE and conn.sock in self._conns:
+                        self._flush(conn)
+                self._close_idle()
+        finally:
+            self._shutdown_request = False
+            self._stopped.set()
+    
+    def shutdown(self) -> None:
+        self._shutdown_request = True
+        self._stopped.wait()
+    
+    def server_close(self) -> None:
+        for conn in list(self._conns.values()):
+            self._close(conn)
+        self._selector.close()
+        self.socket.close()
+    
+    def _accept(self) -> None:
+        while True:
+            try:
+                sock, _ = self.socket.accept()
+            except (BlockingIOError, InterruptedError):
                 return
-            
-            if path == "/api/config" and method == "PUT":
-                data = self._read_json()
-                service.update_config(data)
-                self._json_response({"success": True, "config": service.get_config()})
+            except OSError as e:
+                logger.warning("接受连接失败: %s", e)
                 return
-            
-            if path == "/api/toggle" and method == "POST":
-                data = self._read_json()
-                enabled = data.get("enabled", True)
-                service.toggle_leds(bool(enabled))
-                self._json_response({"success": True, "led_enabled": service.config.led_enabled})
+            sock.setblocking(False)
+            conn = _Connection(sock)
+            self._conns[sock] = conn
+            self._selector.register(sock, selectors.EVENT_READ, conn)
+    
+    def _on_readable(self, conn: _Connection) -> None:
+        try:
+            data = conn.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._close(conn)
+            return
+        if not data:
+            self._close(conn)
+            return
+        conn.last_active = time.monotonic()
+        if conn.closing:
+            return
+        conn.inbuf += data
+        
+        # 依次处理缓冲区中已完整接收的请求（支持流水线请求）
+        while not conn.closing:
+            raw = self._next_request(conn)
+            if raw is None:
+                break
+            handler_sock = _BufferedRequest(raw)
+            try:
+                handler = _InlineAPIHandler(handler_sock, self.server_address, self)
+                conn.closing = handler.close_connection
+            except Exception as e:
+                logger.exception("API 请求处理异常: %s", e)
+                conn.closing = True
+            conn.outbuf += handler_sock.output
+        self._flush(conn)
+    
+    def _next_request(self, conn: _Connection) -> Optional[bytes]:
+        """从输入缓冲中取出一个完整请求，数据不足时返回 None"""
+        buf = conn.inbuf
+        end = buf.find(b"\r\n\r\n")
+        if end < 0:
+            if len(buf) > MAX_REQUEST_SIZE:
+                conn.closing = True
+            return None
+        m = CONTENT_LENGTH_RE.search(buf, 0, end)
+        total = end + 4 + (int(m.group(1)) if m else 0)
+        if total > MAX_REQUEST_SIZE:
+            conn.closing = True
+            return None
+        if len(buf) < total:
+            return None
+        raw = bytes(buf[:total])
+        del buf[:total]
+        return raw
+    
+    def _flush(self, conn: _Connection) -> None:
+        while conn.outbuf:
+            try:
+                sent = conn.sock.send(conn.outbuf)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                self._close(conn)
                 return
-            
-            self._json_response({"error": "not found"}, 404)
-        except Exception as e:
-            logger.exception(f"API 错误: {e}")
-            self._json_response({"error": str(e)}, 500)
+            del conn.outbuf[:sent]
+        
+        if conn.outbuf:
+            # 发送缓冲区已满，等待可写后继续发送
+            if not conn.writing:
+                conn.writing = True
+                self._selector.modify(conn.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, conn)
+            return
+        if conn.closing:
+            self._close(conn)
+        elif conn.writing:
+            conn.writing = False
+            self._selector.modify(conn.sock, selectors.EVENT_READ, conn)
+    
+    def _close_idle(self) -> None:
+        """关闭空闲超过 KEEPALIVE_TIMEOUT 的长连接"""
+        deadline = time.monotonic() - KEEPALIVE_TIMEOUT
+        for conn in [c for c in self._conns.values() if c.last_active < deadline]:
+            self._close(conn)
+    
+    def _close(self, conn: _Connection) -> None:
+        if self._conns.pop(conn.sock, None) is None:
+            return
+        self._selector.unregister(conn.sock)
+        conn.sock.close()
 
 
 def run_server(unix_socket: str = None, config_path: str = None):
@@ -880,17 +1543,15 @@ def run_server(unix_socket: str = None, config_path: str = None):
         if os.path.exists(unix_socket):
             os.unlink(unix_socket)
         
-        server = ThreadingHTTPServer(("", 0), APIHandler, bind_and_activate=False)
+        # 本机 Unix socket 流量使用单线程事件循环处理，TCP 模式仍使用线程池
         sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         sock.bind(unix_socket)
-        server.socket = sock
-        server.address_family = socket.AF_UNIX
-        server.server_address = unix_socket
-        server.server_activate()
-        logger.info(f"LED控制服务启动于 unix://{unix_socket}")
+        sock.listen()
+        server = SelectorHTTPServer(sock, unix_socket)
+        logger.info("LED控制服务启动于 unix://%s", unix_socket)
     else:
-        server = ThreadingHTTPServer(("0.0.0.0", 28258), APIHandler)
+        server = PooledHTTPServer(("0.0.0.0", 28258), PooledAPIHandler, workers=service.config.api_workers)
         logger.info("LED控制服务启动于 http://0.0.0.0:28258")
     
     shutdown_event = threading.Event()